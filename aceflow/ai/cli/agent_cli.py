@@ -16,6 +16,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 from engines.rule_based_engine import get_decision_engine, DecisionResult
 
+
 class AceFlowCLI:
     """AceFlow CLI工具"""
     
@@ -24,9 +25,16 @@ class AceFlowCLI:
         self.aceflow_dir = self.project_root / ".aceflow"
         self.version = "2.0.0"
         self.engine = get_decision_engine(self.project_root)
+        
+        # 能力描述是静态内容，按输出格式缓存渲染结果
+        self._describe_cache: Dict[str, str] = {}
     
     def describe(self, output_format: str = "json") -> str:
         """描述工具能力，供Agent发现和理解"""
+        cached = self._describe_cache.get(output_format)
+        if cached is not None:
+            return cached
+        
         description = {
             "name": "AceFlow",
             "version": self.version,
@@ -107,11 +115,14 @@ class AceFlowCLI:
         }
         
         if output_format == "yaml":
-            return yaml.dump(description, default_flow_style=False, allow_unicode=True)
+            rendered = yaml.dump(description, default_flow_style=False, allow_unicode=True)
         elif output_format == "text":
-            return self._format_description_text(description)
+            rendered = self._format_description_text(description)
         else:
-            return json.dumps(description, indent=2, ensure_ascii=False)
+            rendered = json.dumps(description, indent=2, ensure_ascii=False)
+        
+        self._describe_cache[output_format] = rendered
+        return rendered
     
     def suggest(self, task: str, **kwargs) -> Dict[str, Any]:
         """智能工作流推荐"""
@@ -6,6 +6,9 @@ AceFlow v2.0 智能决策引擎
 import json
 import yaml
 import logging
+import weakref
+from collections import deque
+from types import MappingProxyType
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
@@ -330,9 +333,55 @@ class ProgressPredictionModel:
         
         return int(hours)
 
+def _write_decision_log(buffer: deque, log_file: Path):
+    """将缓冲的决策记录一次性追加到决策日志文件"""
+    if not buffer:
+        return
+    
+    lines = [buffer.popleft() for _ in range(len(buffer))]
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(''.join(lines))
+
 class AIDecisionEngine:
     """AI决策引擎主类"""
     
+    # 决策日志缓冲条数，攒满后批量写入
+    LOG_FLUSH_SIZE = 64
+    
+    # 替代方案原因与任务建议模板，类定义时构建一次，各次决策共享且只读
+    _ALTERNATIVE_REASONS = MappingProxyType({
+        'minimal': "如果需要快速交付，可考虑轻量级流程",
+        'standard': "如果需要平衡效率和质量，可考虑标准流程", 
+        'complete': "如果质量要求极高，可考虑完整流程"
+    })
+    _TASK_SUGGESTIONS = MappingProxyType({
+        TaskType.FEATURE_DEVELOPMENT: (
+            "明确功能需求和验收标准",
+            "设计用户界面和交互流程",
+            "编写核心功能代码",
+            "进行功能测试和用户验证"
+        ),
+        TaskType.BUG_FIX: (
+            "重现和分析问题",
+            "定位问题根本原因",
+            "实施修复方案",
+            "验证修复效果"
+        ),
+        TaskType.REFACTORING: (
+            "分析当前代码结构",
+            "制定重构计划",
+            "逐步重构实施",
+            "回归测试验证"
+        )
+    })
+    _DEFAULT_TASK_SUGGESTIONS = (
+        "分析任务需求",
+        "制定实施计划", 
+        "执行具体工作",
+        "验证完成效果"
+    )
+    _COMPLETE_FLOW_EXTRA_SUGGESTIONS = ("详细文档记录", "团队评审确认")
+    
     def __init__(self, aceflow_dir: Path):
         self.aceflow_dir = aceflow_dir
         self.ai_dir = aceflow_dir / "ai"
@@ -351,6 +400,12 @@ class AIDecisionEngine:
         # 设置日志
         self._setup_logging()
         
+        # 决策日志先写入缓冲区，批量追加到文件；
+        # 引擎被回收或进程正常退出时由 finalize 写出剩余条目，且不延长引擎的生命周期
+        self._decision_log_buffer: deque = deque()
+        self._decision_log_file = self.data_dir / "decision_log.jsonl"
+        weakref.finalize(self, _write_decision_log, self._decision_log_buffer, self._decision_log_file)
+        
         # 加载预训练模型
         self._load_models()
     
@@ -469,13 +524,19 @@ class AIDecisionEngine:
     
     def _explain_decision(self, task_type: TaskType, recommended_flow: str, project_context: ProjectContext) -> str:
         """生成决策推理解释"""
-        explanations = {
-            'minimal': f"推荐轻量级流程，因为{self._get_minimal_reason(task_type, project_context)}",
-            'standard': f"推荐标准流程，因为{self._get_standard_reason(task_type, project_context)}",
-            'complete': f"推荐完整流程，因为{self._get_complete_reason(task_type, project_context)}"
+        # 只为被推荐的流程生成原因，避免每次都计算三份解释
+        explainers = {
+            'minimal': ("推荐轻量级流程", self._get_minimal_reason),
+            'standard': ("推荐标准流程", self._get_standard_reason),
+            'complete': ("推荐完整流程", self._get_complete_reason)
         }
         
-        return explanations.get(recommended_flow, "基于项目特性推荐此流程模式")
+        explainer = explainers.get(recommended_flow)
+        if explainer is None:
+            return "基于项目特性推荐此流程模式"
+        
+        prefix, get_reason = explainer
+        return f"{prefix}，因为{get_reason(task_type, project_context)}"
     
     def _get_minimal_reason(self, task_type: TaskType, project_context: ProjectContext) -> str:
         """获取轻量级流程推荐原因"""
@@ -533,50 +594,19 @@ class AIDecisionEngine:
     
     def _get_alternative_reason(self, flow: str, task_type: TaskType) -> str:
         """获取替代方案推荐原因"""
-        reasons = {
-            'minimal': "如果需要快速交付，可考虑轻量级流程",
-            'standard': "如果需要平衡效率和质量，可考虑标准流程", 
-            'complete': "如果质量要求极高，可考虑完整流程"
-        }
-        return reasons.get(flow, "可根据具体情况选择")
+        return self._ALTERNATIVE_REASONS.get(flow, "可根据具体情况选择")
     
     def _generate_task_suggestions(self, task_type: TaskType, recommended_flow: str) -> List[str]:
         """生成任务建议"""
-        base_suggestions = {
-            TaskType.FEATURE_DEVELOPMENT: [
-                "明确功能需求和验收标准",
-                "设计用户界面和交互流程",
-                "编写核心功能代码",
-                "进行功能测试和用户验证"
-            ],
-            TaskType.BUG_FIX: [
-                "重现和分析问题",
-                "定位问题根本原因",
-                "实施修复方案",
-                "验证修复效果"
-            ],
-            TaskType.REFACTORING: [
-                "分析当前代码结构",
-                "制定重构计划",
-                "逐步重构实施",
-                "回归测试验证"
-            ]
-        }
-        
-        suggestions = base_suggestions.get(task_type, [
-            "分析任务需求",
-            "制定实施计划", 
-            "执行具体工作",
-            "验证完成效果"
-        ])
+        suggestions = self._TASK_SUGGESTIONS.get(task_type, self._DEFAULT_TASK_SUGGESTIONS)
         
-        # 根据流程模式调整建议数量
+        # 根据流程模式调整建议数量；模板是共享元组，返回给调用方的是新列表
         if recommended_flow == 'minimal':
-            return suggestions[:3]
+            return list(suggestions[:3])
         elif recommended_flow == 'standard':
-            return suggestions
+            return list(suggestions)
         else:  # complete
-            return suggestions + ["详细文档记录", "团队评审确认"]
+            return [*suggestions, *self._COMPLETE_FLOW_EXTRA_SUGGESTIONS]
     
     def _assess_risks(self, task_context: TaskContext, project_context: ProjectContext) -> Dict[str, float]:
         """评估项目风险"""
@@ -605,7 +635,12 @@ class AIDecisionEngine:
         return {k: min(1.0, v) for k, v in risks.items()}
     
     def _log_decision(self, decision: AIDecision, task_context: TaskContext, project_context: ProjectContext):
-        """记录AI决策用于后续学习"""
+        """记录AI决策用于后续学习
+
+        记录先进入内存缓冲区，满 LOG_FLUSH_SIZE 条、调用 flush_decision_log、
+        引擎被回收或进程正常退出时才写入文件；进程崩溃或被 SIGKILL 终止时，
+        尚未写出的记录会丢失
+        """
         log_entry = {
             'timestamp': datetime.now().isoformat(),
             'task_context': {
@@ -621,10 +656,13 @@ class AIDecisionEngine:
             'decision': decision.to_dict()
         }
         
-        # 保存到决策日志文件
-        log_file = self.data_dir / "decision_log.jsonl"
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        self._decision_log_buffer.append(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        if len(self._decision_log_buffer) >= self.LOG_FLUSH_SIZE:
+            self.flush_decision_log()
+    
+    def flush_decision_log(self):
+        """将缓冲的决策记录一次性追加到决策日志文件"""
+        _write_decision_log(self._decision_log_buffer, self._decision_log_file)
     
     def _get_default_decision(self) -> AIDecision:
         """获取默认决策（错误情况下的备用方案）"""
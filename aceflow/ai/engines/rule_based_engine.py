@@ -10,6 +10,7 @@ import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
+from types import MappingProxyType
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -660,6 +661,37 @@ class RuleEngine:
 class RuleBasedDecisionEngine:
     """基于规则的决策引擎"""
     
+    # 各流程模式的步骤与替代方案原因模板，类定义时构建一次，各次决策共享且只读
+    _FLOW_STEPS = MappingProxyType({
+        "minimal": (
+            "Planning (P): 需求分析和任务规划",
+            "Development (D): 开发实现",
+            "Review (R): 代码审查和测试验证"
+        ),
+        "standard": (
+            "Planning 1 (P1): 需求分析和架构设计",
+            "Planning 2 (P2): 详细设计和任务分解",
+            "Development 1 (D1): 核心功能开发",
+            "Development 2 (D2): 集成和优化",
+            "Review 1 (R1): 测试和质量验证"
+        ),
+        "complete": (
+            "Strategy (S1): 项目策略和目标制定",
+            "Analysis (S2): 需求分析和可行性研究",
+            "Design (S3): 系统设计和架构规划",
+            "Planning (S4): 详细计划和资源分配",
+            "Development (S5): 开发实现",
+            "Integration (S6): 系统集成和联调",
+            "Testing (S7): 全面测试和质量保证",
+            "Deployment (S8): 部署和上线"
+        )
+    })
+    _ALTERNATIVE_REASONS = MappingProxyType({
+        "minimal": "如果时间紧迫或团队经验丰富，可以选择轻量级流程",
+        "standard": "如果需要平衡效率和质量，可以选择标准流程",
+        "complete": "如果质量要求很高或团队较大，可以选择完整流程"
+    })
+    
     def __init__(self, project_root: Path = None):
         self.project_root = project_root or Path.cwd()
         self.pattern_matcher = PatternMatcher()
@@ -731,32 +763,8 @@ class RuleBasedDecisionEngine:
     
     def _generate_steps(self, flow_mode: str) -> List[str]:
         """生成流程步骤"""
-        flow_steps = {
-            "minimal": [
-                "Planning (P): 需求分析和任务规划",
-                "Development (D): 开发实现",
-                "Review (R): 代码审查和测试验证"
-            ],
-            "standard": [
-                "Planning 1 (P1): 需求分析和架构设计",
-                "Planning 2 (P2): 详细设计和任务分解",
-                "Development 1 (D1): 核心功能开发",
-                "Development 2 (D2): 集成和优化",
-                "Review 1 (R1): 测试和质量验证"
-            ],
-            "complete": [
-                "Strategy (S1): 项目策略和目标制定",
-                "Analysis (S2): 需求分析和可行性研究",
-                "Design (S3): 系统设计和架构规划",
-                "Planning (S4): 详细计划和资源分配",
-                "Development (S5): 开发实现",
-                "Integration (S6): 系统集成和联调",
-                "Testing (S7): 全面测试和质量保证",
-                "Deployment (S8): 部署和上线"
-            ]
-        }
-        
-        return flow_steps.get(flow_mode, flow_steps["standard"])
+        # 模板是共享元组，返回给调用方的是新列表
+        return list(self._FLOW_STEPS.get(flow_mode, self._FLOW_STEPS["standard"]))
     
     def _generate_reasoning(self, task_type: TaskType, project_profile: ProjectProfile, 
                           recommended_flow: str, confidence: float) -> str:
@@ -825,13 +833,7 @@ class RuleBasedDecisionEngine:
     
     def _get_alternative_reason(self, flow: str, score: float) -> str:
         """获取替代方案的推荐理由"""
-        reasons = {
-            "minimal": "如果时间紧迫或团队经验丰富，可以选择轻量级流程",
-            "standard": "如果需要平衡效率和质量，可以选择标准流程",
-            "complete": "如果质量要求很高或团队较大，可以选择完整流程"
-        }
-        
-        base_reason = reasons.get(flow, "可以考虑此流程")
+        base_reason = self._ALTERNATIVE_REASONS.get(flow, "可以考虑此流程")
         
         if score > 0.5:
             return f"{base_reason}（匹配度：{score:.1%}）"
@@ -12,9 +12,49 @@ import time
 import yaml
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 
 # 添加 pateoas 模块路径
-sys.path.insert(0, str(Path(__file__).parent))
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+# 基础分析的任务类型关键词及推荐模式，静态查找表只构建一次
+_TASK_KEYWORDS = MappingProxyType({
+    'bug': ('修复', 'fix', 'bug', '问题', '错误'),
+    'feature': ('新功能', '开发', '实现', '添加', '功能'),
+    'refactor': ('重构', '优化', '改进', '重写'),
+    'project': ('项目', '系统', '平台', '架构')
+})
+
+_MODE_BY_TASK_TYPE = MappingProxyType({
+    'bug': 'minimal',
+    'feature': 'standard',
+    'refactor': 'standard',
+    'project': 'complete',
+    'unknown': 'smart'
+})
+
+# 各模式的阶段流程及首阶段
+_FIRST_STAGE = MappingProxyType({
+    'minimal': 'P',
+    'standard': 'P1',
+    'complete': 'S1',
+    'smart': 'S1'
+})
+
+_STAGE_FLOWS = MappingProxyType({
+    'minimal': ('P', 'D', 'R'),
+    'standard': ('P1', 'P2', 'D1', 'D2', 'R1'),
+    'complete': ('S1', 'S2', 'S3', 'S4', 'S5', 'S6', 'S7', 'S8'),
+    'smart': ('S1', 'S2', 'S3', 'S4', 'S5', 'S6', 'S7', 'S8')
+})
+
+# 按模式预先计算每个阶段的下一阶段
+_NEXT_STAGE_BY_MODE = MappingProxyType({
+    mode: MappingProxyType(dict(zip(flow, flow[1:])))
+    for mode, flow in _STAGE_FLOWS.items()
+})
 
 class EnhancedAceFlowCLI:
     def __init__(self):
@@ -179,7 +219,7 @@ class EnhancedAceFlowCLI:
                 current_state = self.pateoas_engine.state_continuity.get_current_state()
                 if current_state.get('workflow_state', {}).get('current_stage'):
                     print(f"\n💡 智能建议:")
-                    declaration = self.pateoas_engine.state_continuity.generate_state_declaration()
+                    declaration = self.pateoas_engine.state_continuity.state_declaration_view()
                     for suggestion in declaration.get('next_suggestions', [])[:3]:
                         print(f"  • {suggestion.get('description', 'N/A')}")
                         
@@ -224,28 +264,14 @@ class EnhancedAceFlowCLI:
     
     def _basic_analyze(self, task_description):
         """基础任务分析"""
-        keywords = {
-            'bug': ['修复', 'fix', 'bug', '问题', '错误'],
-            'feature': ['新功能', '开发', '实现', '添加', '功能'],
-            'refactor': ['重构', '优化', '改进', '重写'],
-            'project': ['项目', '系统', '平台', '架构']
-        }
-        
         task_type = 'unknown'
-        for category, kw_list in keywords.items():
-            if any(kw in task_description.lower() for kw in kw_list):
+        description_lower = task_description.lower()
+        for category, kw_list in _TASK_KEYWORDS.items():
+            if any(kw in description_lower for kw in kw_list):
                 task_type = category
                 break
         
-        mode_mapping = {
-            'bug': 'minimal',
-            'feature': 'standard',
-            'refactor': 'standard',
-            'project': 'complete',
-            'unknown': 'smart'
-        }
-        
-        recommended_mode = mode_mapping.get(task_type, 'smart')
+        recommended_mode = _MODE_BY_TASK_TYPE.get(task_type, 'smart')
         
         result = {
             'task_description': task_description,
@@ -341,7 +367,7 @@ class EnhancedAceFlowCLI:
         # 显示下一步建议
         if self.pateoas_engine:
             try:
-                declaration = self.pateoas_engine.state_continuity.generate_state_declaration()
+                declaration = self.pateoas_engine.state_continuity.state_declaration_view()
                 if declaration.get('next_suggestions'):
                     print(f"\n💡 智能建议:")
                     for suggestion in declaration['next_suggestions'][:2]:
@@ -354,13 +380,7 @@ class EnhancedAceFlowCLI:
     
     def _get_first_stage(self, mode):
         """获取模式的第一个阶段"""
-        stage_mapping = {
-            'minimal': 'P',
-            'standard': 'P1',
-            'complete': 'S1',
-            'smart': 'S1'
-        }
-        return stage_mapping.get(mode, 'S1')
+        return _FIRST_STAGE.get(mode, 'S1')
     
     def progress(self, stage, percentage):
         """更新进度 (PATEOAS增强版)"""
@@ -398,7 +418,7 @@ class EnhancedAceFlowCLI:
         # 显示智能建议
         if self.pateoas_engine and percentage < 100:
             try:
-                declaration = self.pateoas_engine.state_continuity.generate_state_declaration()
+                declaration = self.pateoas_engine.state_continuity.state_declaration_view()
                 if declaration.get('next_suggestions'):
                     print(f"💡 继续建议: {declaration['next_suggestions'][0].get('description', 'N/A')}")
             except:
@@ -463,20 +483,10 @@ class EnhancedAceFlowCLI:
     
     def _get_next_stage(self, current_stage, mode):
         """获取下一个阶段"""
-        stage_flows = {
-            'minimal': ['P', 'D', 'R'],
-            'standard': ['P1', 'P2', 'D1', 'D2', 'R1'],
-            'complete': ['S1', 'S2', 'S3', 'S4', 'S5', 'S6', 'S7', 'S8'],
-            'smart': ['S1', 'S2', 'S3', 'S4', 'S5', 'S6', 'S7', 'S8']
-        }
-        
-        flow = stage_flows.get(mode, [])
-        if current_stage in flow:
-            current_index = flow.index(current_stage)
-            if current_index + 1 < len(flow):
-                return flow[current_index + 1]
-        
-        return None
+        next_stages = _NEXT_STAGE_BY_MODE.get(mode)
+        if next_stages is None:
+            return None
+        return next_stages.get(current_stage)
     
     def smart_assist(self, user_input):
         """智能助手模式"""
@@ -595,7 +605,7 @@ class EnhancedAceFlowCLI:
             
             # 智能建议
             try:
-                declaration = self.pateoas_engine.state_manager.generate_state_declaration()
+                declaration = self.pateoas_engine.state_manager.state_declaration_view()
                 if declaration.get('next_suggestions'):
                     print(f"\n💡 智能建议:")
                     for i, suggestion in enumerate(declaration['next_suggestions'][:3], 1):
@@ -1005,7 +1015,7 @@ class EnhancedAceFlowCLI:
             patterns.append(f"主要类别: {main_category} ({categories[main_category]}条)")
         
         # 时间分布分析
-        created_ats = [m.get('created_at', '') for m in memories if m.get('created_at')]
+        created_ats = [c for c in (m.get('created_at') for m in memories) if c]
         if created_ats:
             # 简单的时间分析，检查是否大部分是最近的
             import datetime
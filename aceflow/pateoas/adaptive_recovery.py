@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 
 from .models import MemoryFragment, MemoryCategory, NextAction, ActionType
 
@@ -30,6 +31,63 @@ class RecoveryStrategy(Enum):
     IGNORE = "ignore"
 
 
+# 恢复策略到行动类型的映射，转换时直接查表
+_STRATEGY_ACTION_TYPES = MappingProxyType({
+    RecoveryStrategy.RETRY: ActionType.CONTINUE,
+    RecoveryStrategy.FALLBACK: ActionType.PIVOT,
+    RecoveryStrategy.ROLLBACK: ActionType.PIVOT,
+    RecoveryStrategy.ESCALATE: ActionType.ESCALATE,
+    RecoveryStrategy.RESTART: ActionType.CONTINUE,
+    RecoveryStrategy.IGNORE: ActionType.CONTINUE
+})
+
+# 手动处理指令模板：内容与具体上下文无关，按策略预先构建一次
+_MANUAL_INSTRUCTION_TEMPLATES = MappingProxyType({
+    RecoveryStrategy.ESCALATE: {
+        'steps': (
+            "1. 收集错误详细信息和系统状态",
+            "2. 联系技术支持或系统管理员",
+            "3. 提供错误上下文和重现步骤",
+            "4. 等待专业人员处理"
+        ),
+        'precautions': (),
+        'expected_outcome': "专业人员将分析并解决问题",
+        'rollback_plan': ''
+    },
+    RecoveryStrategy.RESTART: {
+        'steps': (
+            "1. 保存当前工作状态",
+            "2. 安全关闭相关组件",
+            "3. 等待30秒",
+            "4. 重新启动组件",
+            "5. 验证系统功能"
+        ),
+        'precautions': ("确保数据已保存", "避免强制终止进程"),
+        'expected_outcome': '',
+        'rollback_plan': "如果重启失败，恢复到备份状态"
+    },
+    RecoveryStrategy.ROLLBACK: {
+        'steps': (
+            "1. 确认回滚目标状态",
+            "2. 备份当前状态",
+            "3. 执行状态回滚",
+            "4. 验证回滚结果",
+            "5. 测试系统功能"
+        ),
+        'precautions': ("确保回滚点有效", "备份当前数据"),
+        'expected_outcome': '',
+        'rollback_plan': ''
+    }
+})
+
+_EMPTY_MANUAL_INSTRUCTIONS = MappingProxyType({
+    'steps': (),
+    'precautions': (),
+    'expected_outcome': '',
+    'rollback_plan': ''
+})
+
+
 @dataclass
 class RecoveryAction:
     """恢复行动"""
@@ -43,17 +101,8 @@ class RecoveryAction:
     
     def to_next_action(self) -> NextAction:
         """转换为NextAction对象"""
-        action_type_mapping = {
-            RecoveryStrategy.RETRY: ActionType.CONTINUE,
-            RecoveryStrategy.FALLBACK: ActionType.PIVOT,
-            RecoveryStrategy.ROLLBACK: ActionType.PIVOT,
-            RecoveryStrategy.ESCALATE: ActionType.ESCALATE,
-            RecoveryStrategy.RESTART: ActionType.CONTINUE,
-            RecoveryStrategy.IGNORE: ActionType.CONTINUE
-        }
-        
         return NextAction(
-            action_type=action_type_mapping.get(self.strategy, ActionType.CONTINUE),
+            action_type=_STRATEGY_ACTION_TYPES.get(self.strategy, ActionType.CONTINUE),
             description=self.description,
             command=f"aceflow recover --strategy {self.strategy.value}",
             confidence=self.confidence,
@@ -469,46 +518,17 @@ class AdaptiveRecoveryStrategy:
     ) -> Dict[str, Any]:
         """生成手动处理指令"""
         
-        instructions = {
+        template = _MANUAL_INSTRUCTION_TEMPLATES.get(strategy.strategy, _EMPTY_MANUAL_INSTRUCTIONS)
+        
+        # 列表字段每次复制一份，调用方修改结果不会影响模板
+        return {
             'strategy': strategy.strategy.value,
             'description': strategy.description,
-            'steps': [],
-            'precautions': [],
-            'expected_outcome': '',
-            'rollback_plan': ''
+            'steps': list(template['steps']),
+            'precautions': list(template['precautions']),
+            'expected_outcome': template['expected_outcome'],
+            'rollback_plan': template['rollback_plan']
         }
-        
-        if strategy.strategy == RecoveryStrategy.ESCALATE:
-            instructions['steps'] = [
-                "1. 收集错误详细信息和系统状态",
-                "2. 联系技术支持或系统管理员",
-                "3. 提供错误上下文和重现步骤",
-                "4. 等待专业人员处理"
-            ]
-            instructions['expected_outcome'] = "专业人员将分析并解决问题"
-            
-        elif strategy.strategy == RecoveryStrategy.RESTART:
-            instructions['steps'] = [
-                "1. 保存当前工作状态",
-                "2. 安全关闭相关组件",
-                "3. 等待30秒",
-                "4. 重新启动组件",
-                "5. 验证系统功能"
-            ]
-            instructions['precautions'] = ["确保数据已保存", "避免强制终止进程"]
-            instructions['rollback_plan'] = "如果重启失败，恢复到备份状态"
-            
-        elif strategy.strategy == RecoveryStrategy.ROLLBACK:
-            instructions['steps'] = [
-                "1. 确认回滚目标状态",
-                "2. 备份当前状态",
-                "3. 执行状态回滚",
-                "4. 验证回滚结果",
-                "5. 测试系统功能"
-            ]
-            instructions['precautions'] = ["确保回滚点有效", "备份当前数据"]
-            
-        return instructions
     
     def get_recovery_statistics(self) -> Dict[str, Any]:
         """获取恢复统计信息"""
@@ -516,6 +536,8 @@ class AdaptiveRecoveryStrategy:
             return {'status': 'no_data'}
         
         total_recoveries = len(self.recovery_history)
+        # 截止时间只计算一次，逐条比较时不再读取时钟和构造timedelta
+        recent_cutoff = datetime.now() - timedelta(hours=24)
         
         # 按错误类型统计
         error_types = {}
@@ -543,6 +565,6 @@ class AdaptiveRecoveryStrategy:
             'error_types': error_types,
             'components': components,
             'strategy_success_rates': self.strategy_success_rates.copy(),
-            'recent_recoveries': len([c for c in self.recovery_history 
-                                    if (datetime.now() - c.timestamp).total_seconds() < 24 * 3600])
+            'recent_recoveries': sum(1 for c in self.recovery_history 
+                                     if c.timestamp > recent_cutoff)
         }
\ No newline at end of file
@@ -5,16 +5,18 @@ PATEOAS CLI命令扩展
 
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 
-from .enhanced_engine import PATEOASEnhancedEngine
-from .optimized_state_manager import OptimizedStateManager
-from .optimized_memory_retrieval import OptimizedMemoryRetrieval
-from .performance_monitor import PATEOASPerformanceMonitor
-from .adaptive_recovery import AdaptiveRecoveryStrategy
 from .config import get_config
 
+if TYPE_CHECKING:
+    # 重量级组件仅在首次访问时导入，避免加载CLI模块时引入numpy等依赖
+    from .enhanced_engine import PATEOASEnhancedEngine
+    from .optimized_state_manager import OptimizedStateManager
+    from .optimized_memory_retrieval import OptimizedMemoryRetrieval
+    from .performance_monitor import PATEOASPerformanceMonitor
+
 
 class PATEOASCLIManager:
     """PATEOAS CLI管理器"""
@@ -30,30 +32,34 @@ class PATEOASCLIManager:
         self._performance_monitor = None
     
     @property
-    def engine(self) -> PATEOASEnhancedEngine:
+    def engine(self) -> 'PATEOASEnhancedEngine':
         """获取PATEOAS引擎实例"""
         if self._engine is None:
+            from .enhanced_engine import PATEOASEnhancedEngine
             self._engine = PATEOASEnhancedEngine(self.project_id)
         return self._engine
     
     @property
-    def state_manager(self) -> OptimizedStateManager:
+    def state_manager(self) -> 'OptimizedStateManager':
         """获取状态管理器实例"""
         if self._state_manager is None:
+            from .optimized_state_manager import OptimizedStateManager
             self._state_manager = OptimizedStateManager(self.project_id)
         return self._state_manager
     
     @property
-    def memory_system(self) -> OptimizedMemoryRetrieval:
+    def memory_system(self) -> 'OptimizedMemoryRetrieval':
         """获取记忆系统实例"""
         if self._memory_system is None:
+            from .optimized_memory_retrieval import OptimizedMemoryRetrieval
             self._memory_system = OptimizedMemoryRetrieval(self.project_id)
         return self._memory_system
     
     @property
-    def performance_monitor(self) -> PATEOASPerformanceMonitor:
+    def performance_monitor(self) -> 'PATEOASPerformanceMonitor':
         """获取性能监控器实例"""
         if self._performance_monitor is None:
+            from .performance_monitor import PATEOASPerformanceMonitor
             self._performance_monitor = PATEOASPerformanceMonitor(self.project_id)
         return self._performance_monitor
 
@@ -71,13 +77,14 @@ class PATEOASCLICommands:
             current_state = self.manager.state_manager.get_current_state_optimized()
             performance_stats = self.manager.performance_monitor.get_performance_summary()
             memory_stats = self.manager.memory_system.get_performance_report()
+            workflow_state = current_state.get('workflow_state', {})
             
             status_data = {
                 'project_id': self.manager.project_id,
                 'timestamp': datetime.now().isoformat(),
                 'system_health': performance_stats['system_health'],
-                'current_stage': current_state.get('workflow_state', {}).get('current_stage', 'unknown'),
-                'task_progress': current_state.get('workflow_state', {}).get('stage_progress', 0),
+                'current_stage': workflow_state.get('current_stage', 'unknown'),
+                'task_progress': workflow_state.get('stage_progress', 0),
                 'performance': {
                     'total_requests': performance_stats['current_metrics']['total_requests'],
                     'success_rate': performance_stats['current_metrics']['successful_requests'] / 
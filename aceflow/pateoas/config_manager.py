@@ -31,6 +31,11 @@ class DeploymentStage(Enum):
     PRODUCTION = "production"
 
 
+def _parse_timestamp(value: Optional[str]) -> datetime:
+    """解析ISO时间戳，缺失时使用当前时间（不再先格式化再解析）"""
+    return datetime.fromisoformat(value) if value else datetime.now()
+
+
 @dataclass
 class FeatureConfig:
     """功能配置"""
@@ -60,8 +65,12 @@ class FeatureConfig:
         
         if user_id:
             # 基于用户ID的一致性哈希来决定是否启用
+            # 分段 update 与原先哈希 "name_user_id" 字符串等价，直接取字节摘要免去十六进制往返
             import hashlib
-            hash_value = int(hashlib.md5(f"{self.name}_{user_id}".encode()).hexdigest(), 16)
+            digest = hashlib.md5(self.name.encode())
+            digest.update(b'_')
+            digest.update(user_id.encode())
+            hash_value = int.from_bytes(digest.digest(), 'big')
             return (hash_value % 100) < self.rollout_percentage
         
         return False
@@ -95,8 +104,8 @@ class FeatureConfig:
             max_version=data.get('max_version'),
             deployment_stages=[DeploymentStage(stage) for stage in data.get('deployment_stages', ['development'])],
             rollout_percentage=data.get('rollout_percentage', 100.0),
-            created_at=datetime.fromisoformat(data.get('created_at', datetime.now().isoformat())),
-            updated_at=datetime.fromisoformat(data.get('updated_at', datetime.now().isoformat()))
+            created_at=_parse_timestamp(data.get('created_at')),
+            updated_at=_parse_timestamp(data.get('updated_at'))
         )
 
 
@@ -213,7 +222,7 @@ class PATEOASConfig:
             log_level=data.get('log_level', 'INFO'),
             pateoas_version=data.get('pateoas_version', '2.0.0'),
             config_version=data.get('config_version', '1.0.0'),
-            last_updated=datetime.fromisoformat(data.get('last_updated', datetime.now().isoformat()))
+            last_updated=_parse_timestamp(data.get('last_updated'))
         )
 
 
@@ -348,10 +357,13 @@ class PATEOASConfigManager:
     
     def is_feature_enabled(self, feature_name: str, user_id: Optional[str] = None) -> bool:
         """检查功能是否启用"""
-        if feature_name not in self.feature_configs:
+        feature = self.feature_configs.get(feature_name)
+        if feature is None:
             return False
         
-        feature = self.feature_configs[feature_name]
+        # 已禁用的功能无需再检查部署阶段和渐进式部署
+        if not feature.enabled:
+            return False
         
         # 检查部署阶段
         if not feature.is_available_for_stage(self.current_deployment_stage):
@@ -5,6 +5,7 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
+from types import MappingProxyType
 from dataclasses import dataclass
 from typing import Dict, List, Any, Tuple
 from datetime import datetime, timedelta
@@ -12,6 +13,15 @@ from .models import MemoryFragment, MemoryCategory
 # 临时注释质量评估导入，使用简化版本
 # from .quality_assessment import ContextAwareQualityAssessment, QualityDimension
 
+# 各阶段的期望进度，静态查找表只构建一次
+_STAGE_PROGRESS_EXPECTATIONS = MappingProxyType({
+    'S1': 0.2, 'S2': 0.4, 'S3': 0.6, 'S4': 0.8, 'S5': 0.9, 'S6': 1.0
+})
+
+# 阶段顺序及每个阶段的下一阶段，按阶段预先计算
+_STAGE_SEQUENCE = ('S1', 'S2', 'S3', 'S4', 'S5', 'S6')
+_NEXT_STAGE = MappingProxyType(dict(zip(_STAGE_SEQUENCE, _STAGE_SEQUENCE[1:])))
+
 
 class DecisionGateResult(Enum):
     """决策门结果枚举"""
@@ -421,11 +431,7 @@ class OptimizedDG2(IntelligentDecisionGate):
         current_stage = current_state.get('current_stage', 'S1')
         
         # 基于阶段的期望进度
-        stage_expectations = {
-            'S1': 0.2, 'S2': 0.4, 'S3': 0.6, 'S4': 0.8, 'S5': 0.9, 'S6': 1.0
-        }
-        
-        expected_progress = stage_expectations.get(current_stage, 0.5)
+        expected_progress = _STAGE_PROGRESS_EXPECTATIONS.get(current_stage, 0.5)
         alignment_score = min(1.0, task_progress / expected_progress) if expected_progress > 0 else 0.5
         
         return alignment_score
@@ -503,14 +509,7 @@ class OptimizedDG2(IntelligentDecisionGate):
     
     def _get_next_stage(self, current_stage: str) -> str:
         """获取下一阶段"""
-        stage_sequence = ['S1', 'S2', 'S3', 'S4', 'S5', 'S6']
-        try:
-            current_index = stage_sequence.index(current_stage)
-            if current_index < len(stage_sequence) - 1:
-                return stage_sequence[current_index + 1]
-        except ValueError:
-            pass
-        return 'Unknown'
+        return _NEXT_STAGE.get(current_stage, 'Unknown')
 
 
 class DecisionGateManager:
@@ -6,6 +6,8 @@ PATEOAS增强引擎
 import json
 import time
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional
 
 from .models import PATEOASState, MemoryFragment, NextAction, ActionType, MemoryCategory
@@ -15,7 +17,73 @@ from .flow_controller import AdaptiveFlowControllerWithPATEOAS
 from .performance_monitor import PATEOASPerformanceMonitor
 from .adaptive_recovery import AdaptiveRecoveryStrategy
 from .config import get_config
-from .utils import calculate_confidence
+from .utils import calculate_confidence, now_iso
+
+
+# 建议优先级评分，排序时直接查表
+_PRIORITY_SCORES = MappingProxyType({
+    'high': 3,
+    'medium': 2,
+    'low': 1
+})
+
+# 模式推荐使用的静态查找表，与调用参数无关，只构建一次
+_DURATION_BY_COMPLEXITY = MappingProxyType({
+    'low': '1-2天',
+    'medium': '3-5天',
+    'high': '1-2周'
+})
+
+_MODE_SUITABILITY_MATRIX = MappingProxyType({
+    'minimal': {'low': 0.9, 'medium': 0.6, 'high': 0.3},
+    'standard': {'low': 0.7, 'medium': 0.9, 'high': 0.7},
+    'complete': {'low': 0.4, 'medium': 0.7, 'high': 0.9}
+})
+
+_MODE_TRADEOFFS = MappingProxyType({
+    ('minimal', 'standard'): '更快但文档较少',
+    ('minimal', 'complete'): '快速但缺乏严格质控',
+    ('standard', 'minimal'): '更规范但时间较长',
+    ('standard', 'complete'): '平衡但不如完整模式严格',
+    ('complete', 'minimal'): '严格质控但耗时更长',
+    ('complete', 'standard'): '最严格但可能过度工程化'
+})
+
+# 增强结果中的固定内容模板，只构建一次；放入结果时复制，调用方修改结果不会影响模板
+_DEFAULT_ALTERNATIVE_PATHS = (
+    MappingProxyType({
+        'path_type': 'fast_track',
+        'description': '快速原型开发路径',
+        'estimated_time_saving': '40%',
+        'risk_level': 'medium'
+    }),
+    MappingProxyType({
+        'path_type': 'thorough',
+        'description': '详细分析和设计路径',
+        'estimated_time_saving': '0%',
+        'risk_level': 'low'
+    })
+)
+
+_ENHANCEMENT_COMPONENTS = ('state_manager', 'memory_system', 'flow_controller', 'decision_gates')
+
+
+@lru_cache(maxsize=128)
+def _mode_justification(mode: str, complexity: str, team_size: str, urgency: str) -> str:
+    """按参数组合生成模式选择理由，相同组合只格式化一次（参数须为已转换的字符串）"""
+    if mode == 'minimal':
+        justification = f"轻量级模式适合{complexity}复杂度任务，{team_size}人团队可快速迭代"
+    elif mode == 'standard':
+        justification = f"标准模式平衡了{complexity}复杂度管控和{team_size}人团队效率"
+    elif mode == 'complete':
+        justification = f"完整模式确保{complexity}复杂度任务的质量，适合{team_size}人规模团队"
+    else:
+        justification = "标准流程选择"
+    
+    if urgency in ('high', 'emergency'):
+        justification += f"，考虑到{urgency}紧急程度已适当简化流程"
+    
+    return justification
 
 
 class PATEOASEnhancedEngine:
@@ -42,8 +110,8 @@ class PATEOASEnhancedEngine:
         # 初始化性能监控系统
         self.performance_monitor = PATEOASPerformanceMonitor(project_id=self.project_id)
         
-        # 初始化自适应恢复策略
-        self.recovery_strategy = AdaptiveRecoveryStrategy()
+        # 自适应恢复策略只在错误处理时使用，首次访问时再创建
+        self._recovery_strategy: Optional[AdaptiveRecoveryStrategy] = None
         
         # 兼容性：保持旧的性能指标接口
         self.performance_metrics = self.performance_monitor.current_metrics
@@ -59,6 +127,13 @@ class PATEOASEnhancedEngine:
         
         print(f"✓ PATEOAS增强引擎已初始化 (项目ID: {self.project_id})")
     
+    @property
+    def recovery_strategy(self) -> AdaptiveRecoveryStrategy:
+        """自适应恢复策略（延迟初始化）"""
+        if self._recovery_strategy is None:
+            self._recovery_strategy = AdaptiveRecoveryStrategy()
+        return self._recovery_strategy
+    
     def _initialize_decision_gates(self) -> Dict[str, Any]:
         """初始化决策门（延迟导入）"""
         try:
@@ -89,7 +164,7 @@ class PATEOASEnhancedEngine:
         Returns:
             增强的处理结果
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.performance_metrics['total_requests'] += 1
         self.current_session['interaction_count'] += 1
         
@@ -143,7 +218,7 @@ class PATEOASEnhancedEngine:
             self.performance_monitor.end_operation(op_id, "state_persistence", True)
             
             # 8. 更新性能指标
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             self.performance_monitor.record_decision_accuracy(enhanced_result['confidence'])
             self._update_performance_metrics(processing_time, True)
             
@@ -155,14 +230,13 @@ class PATEOASEnhancedEngine:
             memory_efficiency = self._calculate_memory_efficiency(relevant_memories, user_input)
             self.performance_monitor.record_memory_efficiency(memory_efficiency)
             
-            self.performance_metrics['successful_requests'] += 1
             self.current_session['last_action'] = enhanced_result['primary_action']
             
             return enhanced_result
             
         except Exception as e:
             # 错误处理
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             self._update_performance_metrics(processing_time, False)
             
             error_result = self._handle_processing_error(e, user_input, current_context)
@@ -219,7 +293,7 @@ class PATEOASEnhancedEngine:
             'current_stage': self._extract_current_stage(project_state),
             'task_progress': self._extract_task_progress(project_state),
             'interaction_count': self.current_session['interaction_count'],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         # 合并外部上下文
@@ -306,7 +380,7 @@ class PATEOASEnhancedEngine:
                 'current_stage': current_state.get('current_stage', 'S1'),
                 'task_progress': current_state.get('task_progress', 0.0),
                 'interaction_count': self.current_session['interaction_count'],
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             },
             
             # 记忆上下文
@@ -325,20 +399,7 @@ class PATEOASEnhancedEngine:
             ),
             
             # 替代路径推荐
-            'alternative_paths': [
-                {
-                    'path_type': 'fast_track',
-                    'description': '快速原型开发路径',
-                    'estimated_time_saving': '40%',
-                    'risk_level': 'medium'
-                },
-                {
-                    'path_type': 'thorough',
-                    'description': '详细分析和设计路径',
-                    'estimated_time_saving': '0%',
-                    'risk_level': 'low'
-                }
-            ],
+            'alternative_paths': [dict(path) for path in _DEFAULT_ALTERNATIVE_PATHS],
             
             # 工作流优化建议
             'workflow_optimization': self._get_workflow_optimization_suggestions(
@@ -359,11 +420,11 @@ class PATEOASEnhancedEngine:
             
             # 元信息
             'meta_information': {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso(),
                 'processing_time': 0.0,
                 'pateoas_version': '2.0.0',
                 'enhancement_level': 'standard',
-                'components_used': ['state_manager', 'memory_system', 'flow_controller', 'decision_gates']
+                'components_used': list(_ENHANCEMENT_COMPONENTS)
             }
         }
         
@@ -411,7 +472,7 @@ class PATEOASEnhancedEngine:
             'last_user_input': user_input,
             'last_result': result,
             'last_state': current_state,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
     
     def _handle_processing_error(
@@ -1392,17 +1453,13 @@ class PATEOASEnhancedEngine:
     def _generate_enhanced_pateoas_state(self, current_state: Dict[str, Any]) -> Dict[str, Any]:
         """生成增强的PATEOAS状态信息"""
         
-        base_state = {
+        # 增强状态信息
+        enhanced_state = {
             'project_id': self.project_id,
             'session_id': self.current_session['session_id'],
             'current_stage': current_state.get('current_stage'),
             'task_progress': current_state.get('task_progress'),
-            'interaction_count': self.current_session['interaction_count']
-        }
-        
-        # 增强状态信息
-        enhanced_state = {
-            **base_state,
+            'interaction_count': self.current_session['interaction_count'],
             'project_context': {
                 'complexity': current_state.get('project_complexity', 'medium'),
                 'team_experience': current_state.get('team_experience', 'medium'),
@@ -1432,15 +1489,11 @@ class PATEOASEnhancedEngine:
     def _generate_enhanced_memory_context(self, memories: List[MemoryFragment], current_state: Dict[str, Any]) -> Dict[str, Any]:
         """生成增强的记忆上下文"""
         
-        base_context = {
-            'relevant_memories_count': len(memories),
-            'memory_categories': self._analyze_memory_categories(memories),
-            'context_richness': current_state.get('memory_context_richness', 0.0)
-        }
-        
         # 增强记忆上下文
         enhanced_context = {
-            **base_context,
+            'relevant_memories_count': len(memories),
+            'memory_categories': self._analyze_memory_categories(memories),
+            'context_richness': current_state.get('memory_context_richness', 0.0),
             'memory_insights': {
                 'most_relevant_category': self._find_most_relevant_category(memories),
                 'knowledge_gaps': self._identify_knowledge_gaps_from_memories(memories),
@@ -1499,8 +1552,9 @@ class PATEOASEnhancedEngine:
         unique_suggestions = self._deduplicate_suggestions(all_suggestions)
         
         # 按优先级和置信度排序
+        priority_score = _PRIORITY_SCORES.get
         return sorted(unique_suggestions, key=lambda x: (
-            self._get_priority_score(x.get('priority', 'medium')),
+            priority_score(x.get('priority', 'medium'), 2),
             x.get('confidence', 0.5)
         ), reverse=True)[:10]  # 返回前10个最佳建议
     
@@ -1551,15 +1605,11 @@ class PATEOASEnhancedEngine:
     ) -> Dict[str, Any]:
         """生成增强的性能洞察"""
         
-        base_insights = {
-            'decision_confidence': decision_result['confidence'],
-            'processing_efficiency': self._calculate_processing_efficiency(),
-            'recommendation_quality': self._assess_recommendation_quality(decision_result)
-        }
-        
         # 增强性能洞察
         enhanced_insights = {
-            **base_insights,
+            'decision_confidence': decision_result['confidence'],
+            'processing_efficiency': self._calculate_processing_efficiency(),
+            'recommendation_quality': self._assess_recommendation_quality(decision_result),
             'productivity_metrics': {
                 'tasks_per_session': self._calculate_tasks_per_session(),
                 'decision_speed': self._calculate_decision_speed(),
@@ -1782,7 +1832,7 @@ class PATEOASEnhancedEngine:
     
     def _calculate_session_duration(self) -> str:
         """计算会话持续时间"""
-        start_time = self.current_session.get('start_time', datetime.now())
+        start_time = self.current_session['start_time']
         duration = datetime.now() - start_time
         minutes = int(duration.total_seconds() / 60)
         
@@ -1795,7 +1845,7 @@ class PATEOASEnhancedEngine:
     
     def _calculate_interaction_rate(self) -> float:
         """计算交互频率"""
-        start_time = self.current_session.get('start_time', datetime.now())
+        start_time = self.current_session['start_time']
         duration_hours = (datetime.now() - start_time).total_seconds() / 3600
         
         if duration_hours > 0:
@@ -1894,8 +1944,13 @@ class PATEOASEnhancedEngine:
         if not memories:
             return 0.0
         
-        categories = set(m.category.value for m in memories)
         max_categories = len(MemoryCategory)
+        categories = set()
+        for m in memories:
+            categories.add(m.category)
+            # 所有类别都已出现时无需继续扫描
+            if len(categories) == max_categories:
+                break
         
         return round(len(categories) / max_categories, 2)
     
@@ -2022,12 +2077,7 @@ class PATEOASEnhancedEngine:
     
     def _get_priority_score(self, priority: str) -> int:
         """获取优先级评分"""
-        priority_scores = {
-            'high': 3,
-            'medium': 2,
-            'low': 1
-        }
-        return priority_scores.get(priority, 2)
+        return _PRIORITY_SCORES.get(priority, 2)
     
     def _generate_web_project_alternatives(self, current_state: Dict[str, Any]) -> List[Dict[str, Any]]:
         """生成Web项目替代路径"""
@@ -2168,14 +2218,14 @@ class PATEOASEnhancedEngine:
     
     def _calculate_session_duration(self) -> str:
         """计算会话持续时间"""
-        start_time = self.current_session.get('start_time', datetime.now())
+        start_time = self.current_session['start_time']
         duration = datetime.now() - start_time
         minutes = int(duration.total_seconds() / 60)
         return f"{minutes}分钟"
     
     def _calculate_interaction_rate(self) -> float:
         """计算交互频率"""
-        start_time = self.current_session.get('start_time', datetime.now())
+        start_time = self.current_session['start_time']
         duration_hours = max(0.1, (datetime.now() - start_time).total_seconds() / 3600)
         interaction_count = self.current_session.get('interaction_count', 1)
         return round(interaction_count / duration_hours, 2)
@@ -2350,7 +2400,7 @@ class PATEOASEnhancedEngine:
     
     def _calculate_session_duration(self) -> float:
         """计算会话持续时间（小时）"""
-        start_time = self.current_session.get('start_time', datetime.now())
+        start_time = self.current_session['start_time']
         duration = (datetime.now() - start_time).total_seconds() / 3600
         return max(0.1, duration)
     
@@ -2610,24 +2660,25 @@ class PATEOASEnhancedEngine:
             }
     
     def _update_performance_metrics(self, processing_time: float, success: bool):
-        """更新性能指标"""
+        """更新性能指标，每次请求只调用一次，成功与失败由success区分"""
+        metrics = self.performance_metrics
         
         # 更新平均响应时间
-        total_requests = self.performance_metrics['total_requests']
-        current_avg = self.performance_metrics['average_response_time']
+        total_requests = metrics['total_requests']
+        current_avg = metrics['average_response_time']
         
         if total_requests > 0:
-            self.performance_metrics['average_response_time'] = (
+            metrics['average_response_time'] = (
                 (current_avg * (total_requests - 1) + processing_time) / total_requests
             )
         else:
-            self.performance_metrics['average_response_time'] = processing_time
+            metrics['average_response_time'] = processing_time
         
         # 更新成功/失败计数
         if success:
-            self.performance_metrics['successful_requests'] += 1
+            metrics['successful_requests'] += 1
         else:
-            self.performance_metrics['failed_requests'] += 1
+            metrics['failed_requests'] += 1
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """获取性能摘要 - 委托给性能监控器"""
@@ -2682,7 +2733,7 @@ class PATEOASEnhancedEngine:
             包含分析结果和推荐的字典
         """
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # 默认项目上下文
             if project_context is None:
@@ -2735,8 +2786,8 @@ class PATEOASEnhancedEngine:
                     'resource_requirements': self._estimate_resource_requirements(task_complexity, team_factors)
                 },
                 'analysis_metadata': {
-                    'analysis_time': datetime.now().isoformat(),
-                    'processing_duration': time.time() - start_time,
+                    'analysis_time': now_iso(),
+                    'processing_duration': time.perf_counter() - start_time,
                     'confidence_score': mode_recommendation.get('confidence', 0.8),
                     'data_sources': {
                         'historical_memories': len(relevant_memories),
@@ -3057,12 +3108,7 @@ class PATEOASEnhancedEngine:
     
     def _estimate_duration_by_complexity(self, complexity: str) -> str:
         """根据复杂度估算持续时间"""
-        duration_map = {
-            'low': '1-2天',
-            'medium': '3-5天', 
-            'high': '1-2周'
-        }
-        return duration_map.get(complexity, '3-5天')
+        return _DURATION_BY_COMPLEXITY.get(complexity, '3-5天')
     
     def _assess_technical_depth(self, task_description: str) -> str:
         """评估技术深度"""
@@ -3130,13 +3176,7 @@ class PATEOASEnhancedEngine:
         complexity = task_complexity['primary_level']
         team_size = team_factors['team_size']
         
-        suitability_matrix = {
-            'minimal': {'low': 0.9, 'medium': 0.6, 'high': 0.3},
-            'standard': {'low': 0.7, 'medium': 0.9, 'high': 0.7},
-            'complete': {'low': 0.4, 'medium': 0.7, 'high': 0.9}
-        }
-        
-        base_score = suitability_matrix[mode][complexity]
+        base_score = _MODE_SUITABILITY_MATRIX[mode][complexity]
         
         # 团队规模调整
         if mode == 'minimal' and team_size > 5:
@@ -3148,35 +3188,17 @@ class PATEOASEnhancedEngine:
     
     def _describe_mode_tradeoffs(self, alternative_mode: str, recommended_mode: str) -> str:
         """描述模式权衡"""
-        tradeoffs = {
-            ('minimal', 'standard'): '更快但文档较少',
-            ('minimal', 'complete'): '快速但缺乏严格质控',
-            ('standard', 'minimal'): '更规范但时间较长',
-            ('standard', 'complete'): '平衡但不如完整模式严格',
-            ('complete', 'minimal'): '严格质控但耗时更长',
-            ('complete', 'standard'): '最严格但可能过度工程化'
-        }
-        
-        return tradeoffs.get((alternative_mode, recommended_mode), '不同的流程权衡')
+        return _MODE_TRADEOFFS.get((alternative_mode, recommended_mode), '不同的流程权衡')
     
     def _generate_mode_justification(self, mode: str, task_complexity: Dict, team_factors: Dict) -> str:
         """生成模式选择理由"""
-        complexity = task_complexity['primary_level']
-        team_size = team_factors['team_size']
-        urgency = team_factors['urgency_level']
-        
-        justifications = {
-            'minimal': f"轻量级模式适合{complexity}复杂度任务，{team_size}人团队可快速迭代",
-            'standard': f"标准模式平衡了{complexity}复杂度管控和{team_size}人团队效率",
-            'complete': f"完整模式确保{complexity}复杂度任务的质量，适合{team_size}人规模团队"
-        }
-        
-        base_justification = justifications.get(mode, "标准流程选择")
-        
-        if urgency in ['high', 'emergency']:
-            base_justification += f"，考虑到{urgency}紧急程度已适当简化流程"
-        
-        return base_justification
+        # 先转换为文本中实际出现的字符串：保证缓存键可哈希，且 5 与 5.0 不共用缓存条目
+        return _mode_justification(
+            str(mode),
+            str(task_complexity['primary_level']),
+            str(team_factors['team_size']),
+            str(team_factors['urgency_level'])
+        )
     
     def _assess_project_risks(self, task_description: str, mode_recommendation: Dict, project_context: Dict) -> Dict[str, Any]:
         """评估项目风险"""
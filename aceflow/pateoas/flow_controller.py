@@ -268,8 +268,9 @@ class AdaptiveFlowController:
         ))
         
         # 步骤2：状态评估
-        current_stage = current_state.get('workflow_state', {}).get('current_stage', 'unknown')
-        progress = current_state.get('workflow_state', {}).get('stage_progress', 0)
+        workflow_state = current_state.get('workflow_state', {})
+        current_stage = workflow_state.get('current_stage', 'unknown')
+        progress = workflow_state.get('stage_progress', 0)
         
         reasoning_chain.append(ReasoningStep(
             step_id="state_assessment",
@@ -9,8 +9,8 @@ from typing import Dict, List, Any, Optional
 import json
 from pathlib import Path
 
-from .models import MemoryFragment, MemoryCategory
-from .utils import calculate_similarity, extract_keywords, is_recent
+from .models import MemoryFragment, MemoryCategory, parse_memory_category
+from .utils import calculate_similarity, extract_keywords, is_recent, intern_tags
 
 
 class BaseMemoryStore(ABC):
@@ -72,9 +72,9 @@ class BaseMemoryStore(ABC):
                     for memory_data in data:
                         memory = MemoryFragment(
                             content=memory_data['content'],
-                            category=MemoryCategory(memory_data['category']),
+                            category=parse_memory_category(memory_data['category']),
                             importance=memory_data['importance'],
-                            tags=memory_data.get('tags', []),
+                            tags=intern_tags(memory_data.get('tags', [])),
                             created_at=datetime.fromisoformat(memory_data['created_at']),
                             last_accessed=datetime.fromisoformat(memory_data.get('last_accessed', memory_data['created_at'])),
                             access_count=memory_data.get('access_count', 0),
@@ -6,18 +6,43 @@
 import json
 import os
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
-from .models import MemoryFragment, MemoryCategory
+from .models import MemoryFragment, MemoryCategory, parse_memory_category
 from .config import get_config
-from .utils import calculate_similarity, extract_keywords, ensure_directory, is_recent
+from .utils import calculate_similarity, extract_keywords, ensure_directory, is_recent, intern_tags
 from .memory_categories import (
     RequirementsMemory, DecisionMemory, PatternMemory, 
     IssueMemory, LearningMemory, ContextMemory
 )
 # from .smart_recall import MemoryRecallEngine, RecallContext
 
+# 专门记忆类型 -> (存储器名称, ((过滤参数, 存储器查询方法), ...))，未指定过滤参数时返回全部记忆
+_SPECIALIZED_MEMORY_QUERIES = MappingProxyType({
+    'requirements': ('requirement', (
+        ('functional_only', 'get_functional_requirements'),
+        ('non_functional_only', 'get_non_functional_requirements')
+    )),
+    'decisions': ('decision', (
+        ('technical_only', 'get_technical_decisions'),
+        ('business_only', 'get_business_decisions')
+    )),
+    'patterns': ('pattern', (
+        ('code_only', 'get_code_patterns'),
+        ('design_only', 'get_design_patterns')
+    )),
+    'issues': ('issue', (
+        ('resolved_only', 'get_resolved_issues'),
+        ('open_only', 'get_open_issues')
+    )),
+    'learning': ('learning', (
+        ('technical_only', 'get_technical_learnings'),
+        ('process_only', 'get_process_learnings')
+    ))
+})
+
 
 class ContextMemorySystem:
     """上下文记忆系统"""
@@ -215,10 +240,7 @@ class ContextMemorySystem:
     
     def add_memory(self, content: str, category: str, importance: float = 0.5, tags: List[str] = None):
         """手动添加记忆"""
-        try:
-            memory_category = MemoryCategory(category)
-        except ValueError:
-            memory_category = MemoryCategory.CONTEXT
+        memory_category = parse_memory_category(category, default=MemoryCategory.CONTEXT)
         
         memory = MemoryFragment(
             content=content,
@@ -274,20 +296,25 @@ class ContextMemorySystem:
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """获取记忆统计信息"""
-        total_memories = sum(len(memories) for memories in self.memory_categories.values())
+        total_memories = 0
+        recent_cutoff = datetime.now() - timedelta(hours=24)
         
         category_stats = {}
         for category, memories in self.memory_categories.items():
-            if memories:
-                avg_importance = sum(m.importance for m in memories) / len(memories)
-                recent_count = sum(1 for m in memories if is_recent(m.created_at, hours=24))
-            else:
-                avg_importance = 0
-                recent_count = 0
+            # 单次遍历同时累计数量、重要性和近期记忆数
+            count = 0
+            importance_sum = 0.0
+            recent_count = 0
+            for m in memories:
+                count += 1
+                importance_sum += m.importance
+                if m.created_at > recent_cutoff:
+                    recent_count += 1
             
+            total_memories += count
             category_stats[category] = {
-                'count': len(memories),
-                'avg_importance': avg_importance,
+                'count': count,
+                'avg_importance': importance_sum / count if count else 0,
                 'recent_count': recent_count
             }
         
@@ -518,9 +545,7 @@ class ContextMemorySystem:
         project_memories = {}
         for memory in all_memories:
             project_id = memory.project_id or 'unknown'
-            if project_id not in project_memories:
-                project_memories[project_id] = []
-            project_memories[project_id].append(memory)
+            project_memories.setdefault(project_id, []).append(memory)
         
         for project_id, memories in project_memories.items():
             self.memory_index['by_project'][project_id] = {
@@ -531,11 +556,10 @@ class ContextMemorySystem:
             }
             
             # 项目内分类统计
+            project_categories = self.memory_index['by_project'][project_id]['categories']
             for memory in memories:
                 category = memory.category.value
-                if category not in self.memory_index['by_project'][project_id]['categories']:
-                    self.memory_index['by_project'][project_id]['categories'][category] = 0
-                self.memory_index['by_project'][project_id]['categories'][category] += 1
+                project_categories[category] = project_categories.get(category, 0) + 1
         
         # 统计信息
         self.memory_index['statistics'] = {
@@ -555,67 +579,7 @@ class ContextMemorySystem:
         """获取专门类型的记忆"""
         results = []
         
-        if memory_type == 'requirements':
-            store = self.memory_stores['requirement']
-            if hasattr(store, 'get_functional_requirements'):
-                if kwargs.get('functional_only'):
-                    memories = store.get_functional_requirements()
-                elif kwargs.get('non_functional_only'):
-                    memories = store.get_non_functional_requirements()
-                else:
-                    memories = store.get_all_memories()
-            else:
-                memories = store.get_all_memories()
-                
-        elif memory_type == 'decisions':
-            store = self.memory_stores['decision']
-            if hasattr(store, 'get_technical_decisions'):
-                if kwargs.get('technical_only'):
-                    memories = store.get_technical_decisions()
-                elif kwargs.get('business_only'):
-                    memories = store.get_business_decisions()
-                else:
-                    memories = store.get_all_memories()
-            else:
-                memories = store.get_all_memories()
-                
-        elif memory_type == 'patterns':
-            store = self.memory_stores['pattern']
-            if hasattr(store, 'get_code_patterns'):
-                if kwargs.get('code_only'):
-                    memories = store.get_code_patterns()
-                elif kwargs.get('design_only'):
-                    memories = store.get_design_patterns()
-                else:
-                    memories = store.get_all_memories()
-            else:
-                memories = store.get_all_memories()
-                
-        elif memory_type == 'issues':
-            store = self.memory_stores['issue']
-            if hasattr(store, 'get_resolved_issues'):
-                if kwargs.get('resolved_only'):
-                    memories = store.get_resolved_issues()
-                elif kwargs.get('open_only'):
-                    memories = store.get_open_issues()
-                else:
-                    memories = store.get_all_memories()
-            else:
-                memories = store.get_all_memories()
-                
-        elif memory_type == 'learning':
-            store = self.memory_stores['learning']
-            if hasattr(store, 'get_technical_learnings'):
-                if kwargs.get('technical_only'):
-                    memories = store.get_technical_learnings()
-                elif kwargs.get('process_only'):
-                    memories = store.get_process_learnings()
-                else:
-                    memories = store.get_all_memories()
-            else:
-                memories = store.get_all_memories()
-                
-        elif memory_type == 'context':
+        if memory_type == 'context':
             store = self.memory_stores['context']
             if hasattr(store, 'get_recent_context'):
                 hours = kwargs.get('hours', 24)
@@ -623,7 +587,18 @@ class ContextMemorySystem:
             else:
                 memories = store.get_all_memories()
         else:
-            return []
+            query = _SPECIALIZED_MEMORY_QUERIES.get(memory_type)
+            if query is None:
+                return []
+            
+            store_name, filters = query
+            store = self.memory_stores[store_name]
+            for flag, method_name in filters:
+                if kwargs.get(flag) and hasattr(store, method_name):
+                    memories = getattr(store, method_name)()
+                    break
+            else:
+                memories = store.get_all_memories()
         
         # 转换为字典格式
         for memory in memories:
@@ -660,9 +635,12 @@ class ContextMemorySystem:
             insights.append("某些信息被频繁引用，可能是核心知识点")
         
         # 分析重要性分布
-        high_importance = len([m for m in all_memories if m.importance > 0.8])
-        medium_importance = len([m for m in all_memories if 0.5 <= m.importance <= 0.8])
-        low_importance = len([m for m in all_memories if m.importance < 0.5])
+        # 单次遍历按桶计数：布尔值相加即为桶下标（0=低, 1=中, 2=高）
+        importance_buckets = [0, 0, 0]
+        for memory in all_memories:
+            importance = memory.importance
+            importance_buckets[(importance >= 0.5) + (importance > 0.8)] += 1
+        low_importance, medium_importance, high_importance = importance_buckets
         
         patterns.append(f"重要性分布: 高({high_importance}) 中({medium_importance}) 低({low_importance})")
         
@@ -839,9 +817,9 @@ class ContextMemorySystem:
                             for memory_data in memory_data_list:
                                 memory = MemoryFragment(
                                     content=memory_data['content'],
-                                    category=MemoryCategory(memory_data['category']),
+                                    category=parse_memory_category(memory_data['category']),
                                     importance=memory_data['importance'],
-                                    tags=memory_data.get('tags', []),
+                                    tags=intern_tags(memory_data.get('tags', [])),
                                     created_at=datetime.fromisoformat(memory_data['created_at']),
                                     last_accessed=datetime.fromisoformat(memory_data.get('last_accessed', memory_data['created_at'])),
                                     access_count=memory_data.get('access_count', 0),
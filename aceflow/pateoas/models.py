@@ -8,6 +8,8 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from enum import Enum
 
+from .utils import intern_tags
+
 
 class ActionType(Enum):
     """行动类型枚举"""
@@ -31,6 +33,27 @@ class MemoryCategory(Enum):
     CONTEXT = "context"
 
 
+# 枚举值到成员的预解析映射，反序列化时免去每次 Enum(value) 的查找开销
+_ACTION_TYPE_BY_VALUE: Dict[str, ActionType] = {a.value: a for a in ActionType}
+_MEMORY_CATEGORY_BY_VALUE: Dict[str, MemoryCategory] = {c.value: c for c in MemoryCategory}
+
+
+def parse_action_type(value: str) -> ActionType:
+    """按值解析行动类型，未知值抛出 ValueError"""
+    action_type = _ACTION_TYPE_BY_VALUE.get(value)
+    return action_type if action_type is not None else ActionType(value)
+
+
+def parse_memory_category(value: str, default: Optional[MemoryCategory] = None) -> MemoryCategory:
+    """按值解析记忆分类，未知值返回 default，未提供 default 时抛出 ValueError"""
+    category = _MEMORY_CATEGORY_BY_VALUE.get(value)
+    if category is not None:
+        return category
+    if default is not None and not isinstance(value, MemoryCategory):
+        return default
+    return MemoryCategory(value)
+
+
 @dataclass
 class MemoryFragment:
     """记忆片段数据模型"""
@@ -213,9 +236,9 @@ class PATEOASState:
         for m_data in data.get('memory_fragments', []):
             memory = MemoryFragment(
                 content=m_data['content'],
-                category=MemoryCategory(m_data['category']),
+                category=parse_memory_category(m_data['category']),
                 importance=m_data['importance'],
-                tags=m_data.get('tags', []),
+                tags=intern_tags(m_data.get('tags', [])),
                 created_at=datetime.fromisoformat(m_data['created_at']),
                 access_count=m_data.get('access_count', 0)
             )
@@ -225,7 +248,7 @@ class PATEOASState:
         next_suggestions = []
         for a_data in data.get('next_suggestions', []):
             action = NextAction(
-                action_type=ActionType(a_data['action_type']),
+                action_type=parse_action_type(a_data['action_type']),
                 description=a_data['description'],
                 command=a_data['command'],
                 confidence=a_data['confidence'],
@@ -4,22 +4,23 @@
 """
 
 import json
+import sys
 import time
 import hashlib
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple, Set
 from pathlib import Path
 from collections import defaultdict, OrderedDict
 import numpy as np
 from dataclasses import dataclass, field
 
-from .models import MemoryFragment, MemoryCategory
+from .models import MemoryFragment, MemoryCategory, parse_memory_category
 from .config import get_config
-from .utils import ensure_directory, calculate_similarity
+from .utils import ensure_directory, calculate_similarity, intern_tags, write_json_file, DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class VectorIndex:
     """向量索引数据结构"""
     memory_id: str
@@ -49,11 +50,11 @@ class VectorIndex:
             category=data['category'],
             importance=data['importance'],
             timestamp=datetime.fromisoformat(data['timestamp']),
-            tags=data.get('tags', [])
+            tags=intern_tags(data.get('tags', []))
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SemanticCacheEntry:
     """语义缓存条目"""
     query_hash: str
@@ -61,23 +62,29 @@ class SemanticCacheEntry:
     results: List[Dict[str, Any]]
     timestamp: datetime
     access_count: int = 0
-    last_access: Optional[datetime] = None
+    # 最近访问时的单调时钟读数，TTL判断只做浮点比较，不受系统时间调整影响
+    last_access: float = field(default_factory=time.monotonic)
     
-    def update_access(self):
+    def update_access(self, now: Optional[float] = None):
         """更新访问信息"""
         self.access_count += 1
-        self.last_access = datetime.now()
+        self.last_access = time.monotonic() if now is None else now
     
-    def is_expired(self, ttl_hours: int = 24) -> bool:
+    def is_expired(self, ttl_hours: int = 24, now: Optional[float] = None) -> bool:
         """检查是否过期"""
-        if not self.last_access:
-            return (datetime.now() - self.timestamp).total_seconds() > ttl_hours * 3600
-        return (datetime.now() - self.last_access).total_seconds() > ttl_hours * 3600
+        return self.is_expired_at(ttl_hours * 3600.0, time.monotonic() if now is None else now)
+    
+    def is_expired_at(self, ttl_seconds: float, now: float) -> bool:
+        """按预先换算的TTL（秒）检查是否过期"""
+        return now - self.last_access > ttl_seconds
 
 
 class VectorIndexManager:
     """向量索引管理器"""
     
+    __slots__ = ('dimension', 'indices', 'category_indices', 'tag_indices', 'importance_sorted',
+                 '_lock', 'stats')
+    
     def __init__(self, dimension: int = 384):
         self.dimension = dimension
         self.indices: Dict[str, VectorIndex] = {}
@@ -153,9 +160,10 @@ class VectorIndexManager:
                 
                 # 计算相似度
                 similarities = []
+                indices = self.indices
                 for memory_id in candidate_ids:
-                    if memory_id in self.indices:
-                        index_entry = self.indices[memory_id]
+                    index_entry = indices.get(memory_id)
+                    if index_entry is not None:
                         similarity = self._cosine_similarity(query_vector, index_entry.vector)
                         
                         if similarity >= min_similarity:
@@ -233,11 +241,11 @@ class VectorIndexManager:
         # 基于字符频率的简单向量化
         vector = np.zeros(self.dimension)
         
-        # 计算字符频率
-        char_freq = {}
+        # 计算字符频率，defaultdict 省去每次计数的 get 查找
+        char_freq = defaultdict(int)
         for char in text.lower():
             if char.isalnum():
-                char_freq[char] = char_freq.get(char, 0) + 1
+                char_freq[char] += 1
         
         # 将字符频率映射到向量维度
         for i, char in enumerate('abcdefghijklmnopqrstuvwxyz0123456789'):
@@ -314,9 +322,12 @@ class VectorIndexManager:
 class SemanticCache:
     """语义缓存系统"""
     
+    __slots__ = ('max_size', 'ttl_hours', '_ttl', 'cache', '_lock', 'stats')
+    
     def __init__(self, max_size: int = 1000, ttl_hours: int = 24):
         self.max_size = max_size
         self.ttl_hours = ttl_hours
+        self._ttl = ttl_hours * 3600.0  # 预先换算为秒，过期检查时直接比较
         self.cache: OrderedDict[str, SemanticCacheEntry] = OrderedDict()
         self._lock = threading.RLock()
         
@@ -332,12 +343,14 @@ class SemanticCache:
         """获取缓存结果"""
         with self._lock:
             query_hash = self._hash_query(query)
+            # 整个查询只读取一次单调时钟，相似度扫描时逐条目只做浮点比较
+            now = time.monotonic()
             
             # 检查精确匹配
-            if query_hash in self.cache:
-                entry = self.cache[query_hash]
-                if not entry.is_expired(self.ttl_hours):
-                    entry.update_access()
+            entry = self.cache.get(query_hash)
+            if entry is not None:
+                if not entry.is_expired_at(self._ttl, now):
+                    entry.update_access(now)
                     # 移动到末尾（LRU）
                     self.cache.move_to_end(query_hash)
                     self.stats['hits'] += 1
@@ -348,10 +361,10 @@ class SemanticCache:
             
             # 检查语义相似的查询
             for cached_hash, entry in self.cache.items():
-                if not entry.is_expired(self.ttl_hours):
+                if not entry.is_expired_at(self._ttl, now):
                     similarity = self._calculate_query_similarity(query, entry.query_text)
                     if similarity >= similarity_threshold:
-                        entry.update_access()
+                        entry.update_access(now)
                         self.cache.move_to_end(cached_hash)
                         self.stats['hits'] += 1
                         return entry.results
@@ -380,18 +393,19 @@ class SemanticCache:
             entry.update_access()
             
             self.cache[query_hash] = entry
+            self.cache.move_to_end(query_hash)
             self.stats['total_queries'] += 1
     
     def clear_expired(self):
         """清理过期缓存"""
         with self._lock:
-            expired_keys = [
-                key for key, entry in self.cache.items()
-                if entry.is_expired(self.ttl_hours)
-            ]
-            
-            for key in expired_keys:
-                del self.cache[key]
+            now = time.monotonic()
+            # 缓存按最近访问时间排序（LRU），过期条目都在头部，遇到第一个未过期条目即可停止
+            while self.cache:
+                oldest_hash, oldest_entry = next(iter(self.cache.items()))
+                if not oldest_entry.is_expired_at(self._ttl, now):
+                    break
+                del self.cache[oldest_hash]
     
     def get_stats(self) -> Dict[str, Any]:
         """获取缓存统计"""
@@ -408,7 +422,8 @@ class SemanticCache:
     
     def _hash_query(self, query: str) -> str:
         """生成查询哈希"""
-        return hashlib.md5(query.lower().strip().encode()).hexdigest()
+        # 仅用作缓存键，无需加密强度；blake2b 短摘要比 md5 更快
+        return hashlib.blake2b(query.lower().strip().encode('utf-8'), digest_size=8).hexdigest()
     
     def _calculate_query_similarity(self, query1: str, query2: str) -> float:
         """计算查询相似度（简化实现）"""
@@ -566,16 +581,17 @@ class OptimizedMemoryRetrieval:
             min_similarity=min_similarity
         )
         
-        # 构建结果
+        # 构建结果：同一次检索的访问时间相同，只格式化一次
         results = []
+        access_time = datetime.now().isoformat()
         for memory_id, similarity in similar_ids:
-            if memory_id in self.memories:
-                memory = self.memories[memory_id]
+            memory = self.memories.get(memory_id)
+            if memory is not None:
                 metadata = self.memory_metadata.get(memory_id, {})
                 
                 # 更新访问统计
                 metadata['access_count'] = metadata.get('access_count', 0) + 1
-                metadata['last_access'] = datetime.now().isoformat()
+                metadata['last_access'] = access_time
                 
                 result = {
                     'memory_id': memory_id,
@@ -681,20 +697,22 @@ class OptimizedMemoryRetrieval:
     
     def optimize_indices(self):
         """优化索引"""
-        print("🔧 开始索引优化...")
+        # 优化过程的输出先收集，结束时一次性写出
+        log_lines = ["🔧 开始索引优化..."]
         
         # 清理过期缓存
         self.semantic_cache.clear_expired()
         
         # 重建向量索引（如果需要）
         if len(self.memories) != self.vector_index.stats['total_vectors']:
-            print("  - 重建向量索引...")
+            log_lines.append("  - 重建向量索引...")
             self._rebuild_vector_index()
         
         # 优化内存使用
         self._optimize_memory_usage()
         
-        print("✓ 索引优化完成")
+        log_lines.append("✓ 索引优化完成")
+        print("\n".join(log_lines))
     
     def benchmark_performance(self, num_queries: int = 100) -> Dict[str, Any]:
         """性能基准测试"""
@@ -753,13 +771,16 @@ class OptimizedMemoryRetrieval:
             'performance_grade': self._calculate_performance_grade(avg_vector_time)
         }
         
-        print(f"✓ 基准测试完成:")
-        print(f"  - 平均搜索时间: {avg_vector_time:.6f}s")
-        print(f"  - 平均缓存时间: {avg_cache_time:.6f}s")
-        print(f"  - 每秒查询数: {benchmark_result['queries_per_second']:.1f}")
-        print(f"  - 缓存命中率: {cache_stats['hit_rate']:.2%}")
-        print(f"  - 缓存加速比: {benchmark_result['cache_speedup']:.1f}x")
-        print(f"  - 性能等级: {benchmark_result['performance_grade']}")
+        # 摘要一次性输出，避免逐行写入
+        print("\n".join([
+            "✓ 基准测试完成:",
+            f"  - 平均搜索时间: {avg_vector_time:.6f}s",
+            f"  - 平均缓存时间: {avg_cache_time:.6f}s",
+            f"  - 每秒查询数: {benchmark_result['queries_per_second']:.1f}",
+            f"  - 缓存命中率: {cache_stats['hit_rate']:.2%}",
+            f"  - 缓存加速比: {benchmark_result['cache_speedup']:.1f}x",
+            f"  - 性能等级: {benchmark_result['performance_grade']}"
+        ]))
         
         return benchmark_result
     
@@ -861,17 +882,18 @@ class OptimizedMemoryRetrieval:
                 with open(self.memories_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     
-                    # 恢复记忆
-                    for memory_id, memory_data in data.get('memories', {}).items():
-                        memory = MemoryFragment(
+                    # 恢复记忆：ID 驻留后一次性批量写入，索引文件中的同名 ID 会复用同一字符串
+                    self.memories.update({
+                        sys.intern(memory_id): MemoryFragment(
                             content=memory_data['content'],
-                            category=MemoryCategory(memory_data['category']),
+                            category=parse_memory_category(memory_data['category']),
                             importance=memory_data['importance'],
-                            tags=memory_data.get('tags', []),
+                            tags=intern_tags(memory_data.get('tags', [])),
                             created_at=datetime.fromisoformat(memory_data['created_at']),
                             project_id=memory_data.get('project_id', self.project_id)
                         )
-                        self.memories[memory_id] = memory
+                        for memory_id, memory_data in data.get('memories', {}).items()
+                    })
                     
                     # 恢复元数据
                     self.memory_metadata = data.get('metadata', {})
@@ -884,6 +906,7 @@ class OptimizedMemoryRetrieval:
                     
                     # 恢复向量索引
                     for memory_id, vector_data in index_data.get('indices', {}).items():
+                        memory_id = sys.intern(memory_id)
                         try:
                             vector_index = VectorIndex.from_dict(vector_data)
                             self.vector_index.indices[memory_id] = vector_index
@@ -928,8 +951,9 @@ class OptimizedMemoryRetrieval:
                 'last_saved': datetime.now().isoformat()
             }
             
-            with open(self.memories_file, 'w', encoding='utf-8') as f:
-                json.dump(memories_data, f, ensure_ascii=False, indent=2)
+            # 记忆和索引文件仅供程序读取，调试模式下才缩进美化
+            pretty = self.config.debug_mode
+            write_json_file(self.memories_file, memories_data, pretty=pretty)
             
             # 保存向量索引
             index_data = {
@@ -941,8 +965,7 @@ class OptimizedMemoryRetrieval:
                 'last_saved': datetime.now().isoformat()
             }
             
-            with open(self.index_file, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, ensure_ascii=False, indent=2)
+            write_json_file(self.index_file, index_data, pretty=pretty)
                 
         except Exception as e:
             print(f"⚠️ 保存记忆和索引失败: {e}")
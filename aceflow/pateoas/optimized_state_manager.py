@@ -8,24 +8,50 @@ import json
 import time
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
-from collections import OrderedDict
+from collections import defaultdict, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
 import hashlib
 
 from .models import PATEOASState, StateTransition, MemoryFragment
 from .config import get_config
-from .utils import generate_id, ensure_directory
+from .utils import generate_id, ensure_directory, compact_json_dumps, write_json_file, DATACLASS_SLOTS
+
+# 缓存查找的未命中标记，区分缓存中存放的 None 值
+_MISSING = object()
+
+# 默认状态片段模板，使用时通过 _from_template 复制，避免多处重复构建同样的字面量
+_DEFAULT_WORKFLOW_STATE = MappingProxyType({
+    'current_stage': 'S1',
+    'stage_progress': 0.0,
+    'completed_stages': [],
+    'active_tasks': []
+})
+
+_DEFAULT_PROJECT_CONTEXT = MappingProxyType({
+    'project_type': 'general',
+    'complexity': 'medium',
+    'team_size': 1,
+    'timeline': 'flexible'
+})
+
+
+def _from_template(template: MappingProxyType) -> Dict[str, Any]:
+    """复制模板，列表值重新分配以免状态之间共享"""
+    return {key: value.copy() if isinstance(value, list) else value for key, value in template.items()}
 
 
 class LRUCache:
     """LRU缓存实现"""
     
+    __slots__ = ('capacity', 'cache', 'hit_count', 'miss_count', '_lock')
+    
     def __init__(self, capacity: int = 1000):
         self.capacity = capacity
         self.cache = OrderedDict()
-        self.access_times = {}
         self.hit_count = 0
         self.miss_count = 0
         self._lock = threading.RLock()
@@ -33,46 +59,36 @@ class LRUCache:
     def get(self, key: str) -> Optional[Any]:
         """获取缓存项"""
         with self._lock:
-            if key in self.cache:
-                # 移动到末尾（最近使用）
-                value = self.cache.pop(key)
-                self.cache[key] = value
-                self.access_times[key] = time.time()
-                self.hit_count += 1
-                return value
-            else:
+            value = self.cache.get(key, _MISSING)
+            if value is _MISSING:
                 self.miss_count += 1
                 return None
+            # 移动到末尾（最近使用）
+            self.cache.move_to_end(key)
+            self.hit_count += 1
+            return value
     
     def put(self, key: str, value: Any) -> None:
         """添加缓存项"""
         with self._lock:
             if key in self.cache:
                 # 更新现有项
-                self.cache.pop(key)
+                self.cache.move_to_end(key)
             elif len(self.cache) >= self.capacity:
                 # 移除最久未使用的项
-                oldest_key = next(iter(self.cache))
-                self.cache.pop(oldest_key)
-                self.access_times.pop(oldest_key, None)
+                self.cache.popitem(last=False)
             
             self.cache[key] = value
-            self.access_times[key] = time.time()
     
     def remove(self, key: str) -> bool:
         """移除缓存项"""
         with self._lock:
-            if key in self.cache:
-                self.cache.pop(key)
-                self.access_times.pop(key, None)
-                return True
-            return False
+            return self.cache.pop(key, _MISSING) is not _MISSING
     
     def clear(self) -> None:
         """清空缓存"""
         with self._lock:
             self.cache.clear()
-            self.access_times.clear()
             self.hit_count = 0
             self.miss_count = 0
     
@@ -95,38 +111,83 @@ class LRUCache:
 class StateIndex:
     """状态索引，用于快速检索"""
     
-    def __init__(self):
+    __slots__ = ('project_index', 'timestamp_index', 'tag_index', 'max_content_hashes',
+                 'content_hash_index', '_state_entries', '_lock')
+    
+    def __init__(self, max_content_hashes: int = 1000):
         self.project_index = {}  # project_id -> state_keys
         self.timestamp_index = {}  # timestamp -> state_keys
         self.tag_index = {}  # tag -> state_keys
-        self.content_hash_index = {}  # content_hash -> state_key
+        # 每次状态内容变化都会产生新哈希，按LRU限制条目数，避免无限增长
+        self.max_content_hashes = max_content_hashes
+        self.content_hash_index: OrderedDict[str, str] = OrderedDict()  # content_hash -> state_key
+        # 反向索引：state_key -> {(索引名, 分桶键)}，移除状态时只访问它所在的分桶
+        # 内容哈希不登记：哈希索引本身有容量上限，移除时直接扫描即可
+        self._state_entries: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
         self._lock = threading.RLock()
     
     def add_state(self, state_key: str, project_id: str, timestamp: datetime, 
                   tags: List[str] = None, content_hash: str = None):
         """添加状态到索引"""
         with self._lock:
+            entries = self._state_entries[state_key]
+            
             # 项目索引
-            if project_id not in self.project_index:
-                self.project_index[project_id] = set()
-            self.project_index[project_id].add(state_key)
+            self.project_index.setdefault(project_id, set()).add(state_key)
+            entries.add(('project_index', project_id))
             
             # 时间戳索引（按小时分组）
             hour_key = timestamp.strftime('%Y-%m-%d-%H')
-            if hour_key not in self.timestamp_index:
-                self.timestamp_index[hour_key] = set()
-            self.timestamp_index[hour_key].add(state_key)
+            self.timestamp_index.setdefault(hour_key, set()).add(state_key)
+            entries.add(('timestamp_index', hour_key))
             
             # 标签索引
             if tags:
+                tag_index = self.tag_index
                 for tag in tags:
-                    if tag not in self.tag_index:
-                        self.tag_index[tag] = set()
-                    self.tag_index[tag].add(state_key)
+                    tag_index.setdefault(tag, set()).add(state_key)
+                    entries.add(('tag_index', tag))
             
             # 内容哈希索引
             if content_hash:
-                self.content_hash_index[content_hash] = state_key
+                content_hash_index = self.content_hash_index
+                content_hash_index[content_hash] = state_key
+                content_hash_index.move_to_end(content_hash)
+                if len(content_hash_index) > self.max_content_hashes:
+                    content_hash_index.popitem(last=False)
+    
+    def load_buckets(self, project_index: Dict[str, List[str]], tag_index: Dict[str, List[str]]):
+        """从持久化数据重建项目和标签索引，同时登记反向索引"""
+        with self._lock:
+            # 先注销被替换分桶的反向索引登记，避免残留
+            for index_name in ('project_index', 'tag_index'):
+                for bucket_key, state_keys in getattr(self, index_name).items():
+                    for state_key in state_keys:
+                        self._discard_entry(state_key, (index_name, bucket_key))
+            
+            self.project_index = {k: set(v) for k, v in project_index.items()}
+            self.tag_index = {k: set(v) for k, v in tag_index.items()}
+            
+            for index_name, index in (('project_index', self.project_index),
+                                      ('tag_index', self.tag_index)):
+                for bucket_key, state_keys in index.items():
+                    for state_key in state_keys:
+                        self._state_entries[state_key].add((index_name, bucket_key))
+    
+    def drop_timestamp_buckets(self, hour_keys: List[str]):
+        """删除指定的小时分桶，并同步注销反向索引登记"""
+        with self._lock:
+            for hour_key in hour_keys:
+                for state_key in self.timestamp_index.pop(hour_key, ()):
+                    self._discard_entry(state_key, ('timestamp_index', hour_key))
+    
+    def _discard_entry(self, state_key: str, entry: Tuple[str, str]):
+        """从反向索引中注销一条登记，集合为空时一并删除"""
+        entries = self._state_entries.get(state_key)
+        if entries is not None:
+            entries.discard(entry)
+            if not entries:
+                del self._state_entries[state_key]
     
     def find_by_project(self, project_id: str) -> List[str]:
         """根据项目ID查找状态"""
@@ -140,9 +201,9 @@ class StateIndex:
             current = start_time
             
             while current <= end_time:
-                hour_key = current.strftime('%Y-%m-%d-%H')
-                if hour_key in self.timestamp_index:
-                    result.update(self.timestamp_index[hour_key])
+                hour_states = self.timestamp_index.get(current.strftime('%Y-%m-%d-%H'))
+                if hour_states:
+                    result.update(hour_states)
                 current += timedelta(hours=1)
             
             return list(result)
@@ -155,10 +216,10 @@ class StateIndex:
             
             result = self.tag_index.get(tags[0], set())
             for tag in tags[1:]:
-                if tag in self.tag_index:
-                    result = result.intersection(self.tag_index[tag])
-                else:
+                tag_states = self.tag_index.get(tag)
+                if tag_states is None:
                     return []
+                result = result.intersection(tag_states)
             
             return list(result)
     
@@ -170,32 +231,44 @@ class StateIndex:
     def remove_state(self, state_key: str):
         """从索引中移除状态"""
         with self._lock:
-            # 从所有索引中移除
-            for project_states in self.project_index.values():
-                project_states.discard(state_key)
-            
-            for timestamp_states in self.timestamp_index.values():
-                timestamp_states.discard(state_key)
-            
-            for tag_states in self.tag_index.values():
-                tag_states.discard(state_key)
-            
-            # 从内容哈希索引中移除
-            to_remove = []
-            for hash_key, key in self.content_hash_index.items():
-                if key == state_key:
-                    to_remove.append(hash_key)
+            # 只访问该状态登记过的分桶，无需扫描全部索引
+            for index_name, bucket_key in self._state_entries.pop(state_key, ()):
+                index = getattr(self, index_name)
+                bucket = index.get(bucket_key)
+                if bucket is not None:
+                    bucket.discard(state_key)
+                    if not bucket:
+                        del index[bucket_key]
             
-            for hash_key in to_remove:
-                self.content_hash_index.pop(hash_key)
+            # 内容哈希索引容量有限，扫描一遍即可
+            stale_hashes = [h for h, key in self.content_hash_index.items() if key == state_key]
+            for hash_key in stale_hashes:
+                del self.content_hash_index[hash_key]
+
+
+@dataclass(**DATACLASS_SLOTS)
+class PendingOperation:
+    """待处理的异步操作记录"""
+    operation: str
+    start_time: float
+    future: Any
 
 
 class AsyncStateProcessor:
     """异步状态处理器"""
     
+    # 操作名到处理方法名的分发表，类加载时构建一次，避免逐个比较操作名
+    _OPERATION_HANDLERS = MappingProxyType({
+        'serialize': '_serialize_state',
+        'deserialize': '_deserialize_state',
+        'validate': '_validate_state',
+        'compress': '_compress_state',
+        'decompress': '_decompress_state'
+    })
+    
     def __init__(self, max_workers: int = 4):
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.pending_operations = {}
+        self.pending_operations: Dict[str, PendingOperation] = {}
         self._lock = threading.RLock()
     
     async def process_state_async(self, operation: str, state_data: Dict[str, Any], 
@@ -214,11 +287,11 @@ class AsyncStateProcessor:
         # 记录待处理操作
         operation_id = generate_id()
         with self._lock:
-            self.pending_operations[operation_id] = {
-                'operation': operation,
-                'start_time': time.time(),
-                'future': future
-            }
+            self.pending_operations[operation_id] = PendingOperation(
+                operation=operation,
+                start_time=time.perf_counter(),
+                future=future
+            )
         
         try:
             result = await future
@@ -236,22 +309,14 @@ class AsyncStateProcessor:
     
     def _execute_state_operation(self, operation: str, state_data: Dict[str, Any]) -> Any:
         """执行状态操作"""
-        if operation == 'serialize':
-            return self._serialize_state(state_data)
-        elif operation == 'deserialize':
-            return self._deserialize_state(state_data)
-        elif operation == 'validate':
-            return self._validate_state(state_data)
-        elif operation == 'compress':
-            return self._compress_state(state_data)
-        elif operation == 'decompress':
-            return self._decompress_state(state_data)
-        else:
+        handler_name = self._OPERATION_HANDLERS.get(operation)
+        if handler_name is None:
             raise ValueError(f"Unknown operation: {operation}")
+        return getattr(self, handler_name)(state_data)
     
     def _serialize_state(self, state_data: Dict[str, Any]) -> str:
         """序列化状态数据"""
-        return json.dumps(state_data, ensure_ascii=False, separators=(',', ':'))
+        return compact_json_dumps(state_data)
     
     def _deserialize_state(self, serialized_data: Dict[str, Any]) -> Dict[str, Any]:
         """反序列化状态数据"""
@@ -298,8 +363,8 @@ class AsyncStateProcessor:
                 'operations': [
                     {
                         'id': op_id,
-                        'operation': op_info['operation'],
-                        'duration': time.time() - op_info['start_time']
+                        'operation': op_info.operation,
+                        'duration': time.perf_counter() - op_info.start_time
                     }
                     for op_id, op_info in self.pending_operations.items()
                 ]
@@ -319,13 +384,19 @@ class OptimizedStateManager:
         
         # 核心组件
         self.cache = LRUCache(capacity=cache_size)
-        self.index = StateIndex()
+        self.index = StateIndex(max_content_hashes=cache_size)
         self.async_processor = AsyncStateProcessor()
         
         # 状态存储
         self.current_state: Optional[Dict[str, Any]] = None
         self.state_history: List[Dict[str, Any]] = []
         
+        # 当前状态的缓存键只取决于项目ID，构造一次即可
+        self._current_state_key = f"current_state_{project_id}"
+        
+        # 进行中的异步状态获取，并发请求共享同一结果
+        self._inflight_state: Optional[asyncio.Future] = None
+        
         # 性能统计
         self.performance_stats = {
             'cache_hits': 0,
@@ -335,6 +406,8 @@ class OptimizedStateManager:
             'average_operation_time': 0.0,
             'total_operations': 0
         }
+        # 线程池中执行的查询也会更新统计，读改写需加锁
+        self._stats_lock = threading.Lock()
         
         # 存储配置
         self.state_dir = ensure_directory(Path(self.config.state_storage_path) / "optimized")
@@ -348,26 +421,27 @@ class OptimizedStateManager:
     
     def get_current_state(self) -> Dict[str, Any]:
         """获取当前状态（优化版）"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 尝试从缓存获取
-        cache_key = f"current_state_{self.project_id}"
+        cache_key = self._current_state_key
         cached_state = self.cache.get(cache_key)
         
         if cached_state:
-            self.performance_stats['cache_hits'] += 1
-            self._update_performance_stats(time.time() - start_time)
+            self._update_performance_stats(time.perf_counter() - start_time, 'cache_hits')
             return cached_state
         
-        self.performance_stats['cache_misses'] += 1
+        # 未命中在构建前计数，构建失败同样计为一次未命中
+        self._count_operation('cache_misses')
         
         # 缓存未命中，构建状态
         if not self.current_state:
             self._initialize_default_state()
         
+        now = datetime.now()
         state = {
             'project_id': self.project_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'project_context': self._get_project_context(),
             'workflow_state': self._get_workflow_state(),
             'ai_memory': self._get_ai_memory(),
@@ -384,31 +458,48 @@ class OptimizedStateManager:
         self.index.add_state(
             state_key=cache_key,
             project_id=self.project_id,
-            timestamp=datetime.now(),
+            timestamp=now,
             tags=['current', 'active'],
             content_hash=content_hash
         )
         
-        self._update_performance_stats(time.time() - start_time)
+        self._update_performance_stats(time.perf_counter() - start_time)
         return state
     
     async def get_current_state_async(self) -> Dict[str, Any]:
         """异步获取当前状态"""
-        self.performance_stats['async_operations'] += 1
-        
-        # 异步处理状态构建
+        self._count_operation('async_operations')
+        
+        # 并发请求共享同一个构建任务，避免重复构建状态；
+        # 构建在独立任务中运行，某个调用方被取消不会影响其他等待者
+        inflight = self._inflight_state
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._build_current_state_async())
+            self._inflight_state = inflight
+            inflight.add_done_callback(self._clear_inflight_state)
+        return await asyncio.shield(inflight)
+    
+    async def _build_current_state_async(self) -> Dict[str, Any]:
+        """异步构建当前状态"""
         state_data = {'project_id': self.project_id}
         
-        processed_state = await self.async_processor.process_state_async(
+        await self.async_processor.process_state_async(
             operation='deserialize',
             state_data=state_data
         )
         
         return self.get_current_state()
     
+    def _clear_inflight_state(self, task: asyncio.Future):
+        """构建任务结束后清除共享任务"""
+        if self._inflight_state is task:
+            self._inflight_state = None
+        if not task.cancelled():
+            task.exception()  # 标记异常已被读取，等待者都已取消时不再告警
+    
     def update_state(self, new_information: Dict[str, Any], async_mode: bool = False):
         """更新状态（支持异步模式）"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         if async_mode:
             return self._update_state_async(new_information)
@@ -417,7 +508,8 @@ class OptimizedStateManager:
     
     def _update_state_sync(self, new_information: Dict[str, Any], start_time: float):
         """同步更新状态"""
-        self.performance_stats['sync_operations'] += 1
+        # 在操作开始时计数，更新或保存失败同样计为一次同步操作
+        self._count_operation('sync_operations')
         
         if not self.current_state:
             self._initialize_default_state()
@@ -443,30 +535,29 @@ class OptimizedStateManager:
             self.state_history = self.state_history[-50:]
         
         # 更新缓存 - 移除旧缓存，下次获取时会重新构建
-        cache_key = f"current_state_{self.project_id}"
-        self.cache.remove(cache_key)  # 移除旧缓存
+        self.cache.remove(self._current_state_key)  # 移除旧缓存
         
         # 保存状态
         self._save_state()
         
-        self._update_performance_stats(time.time() - start_time)
+        self._update_performance_stats(time.perf_counter() - start_time)
     
     async def _update_state_async(self, new_information: Dict[str, Any]):
         """异步更新状态"""
-        self.performance_stats['async_operations'] += 1
+        self._count_operation('async_operations')
         
         # 异步处理状态更新
         await self.async_processor.process_state_async(
             operation='validate',
             state_data=new_information,
-            callback=lambda result: self._update_state_sync(new_information, time.time())
+            callback=lambda result: self._update_state_sync(new_information, time.perf_counter())
         )
     
     def get_state_history(self, limit: int = 10, 
                          start_time: Optional[datetime] = None,
                          end_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """获取状态历史（支持时间范围查询）"""
-        start_op_time = time.time()
+        start_op_time = time.perf_counter()
         
         # 使用索引快速查找
         if start_time and end_time:
@@ -482,20 +573,20 @@ class OptimizedStateManager:
             # 返回最近的历史记录
             history = self.state_history[-limit:] if self.state_history else []
         
-        self._update_performance_stats(time.time() - start_op_time)
+        self._update_performance_stats(time.perf_counter() - start_op_time)
         return history
     
     def find_similar_states(self, target_state: Dict[str, Any], 
                            similarity_threshold: float = 0.8) -> List[Tuple[str, float]]:
         """查找相似状态"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         target_hash = self._calculate_content_hash(target_state)
         
         # 首先检查是否有完全相同的状态
         exact_match = self.index.find_by_content_hash(target_hash)
         if exact_match:
-            self._update_performance_stats(time.time() - start_time)
+            self._update_performance_stats(time.perf_counter() - start_time)
             return [(exact_match, 1.0)]
         
         # 查找相似状态（简化实现）
@@ -514,22 +605,39 @@ class OptimizedStateManager:
         # 按相似度排序
         similar_states.sort(key=lambda x: x[1], reverse=True)
         
-        self._update_performance_stats(time.time() - start_time)
+        self._update_performance_stats(time.perf_counter() - start_time)
         return similar_states[:10]  # 返回前10个最相似的状态
     
+    async def find_similar_states_async(self, target_state: Dict[str, Any], 
+                                        similarity_threshold: float = 0.8) -> List[Tuple[str, float]]:
+        """异步查找相似状态
+
+        哈希和相似度计算在线程池中执行，多个查询可通过 asyncio.gather 并发进行
+        """
+        self._count_operation('async_operations')
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.async_processor.executor,
+            self.find_similar_states,
+            target_state,
+            similarity_threshold
+        )
+    
     def optimize_cache(self):
         """优化缓存性能"""
-        print("🔧 开始缓存优化...")
+        # 优化过程的输出先收集，结束时一次性写出
+        log_lines = ["🔧 开始缓存优化..."]
         
         # 获取缓存统计
         cache_stats = self.cache.get_stats()
-        print(f"  - 缓存命中率: {cache_stats['hit_rate']:.2%}")
-        print(f"  - 缓存使用率: {cache_stats['size']}/{cache_stats['capacity']}")
+        log_lines.append(f"  - 缓存命中率: {cache_stats['hit_rate']:.2%}")
+        log_lines.append(f"  - 缓存使用率: {cache_stats['size']}/{cache_stats['capacity']}")
         
         # 如果命中率低，增加缓存容量
         if cache_stats['hit_rate'] < 0.7 and cache_stats['size'] >= cache_stats['capacity'] * 0.9:
             new_capacity = int(cache_stats['capacity'] * 1.5)
-            print(f"  - 扩展缓存容量: {cache_stats['capacity']} -> {new_capacity}")
+            log_lines.append(f"  - 扩展缓存容量: {cache_stats['capacity']} -> {new_capacity}")
             
             # 创建新的更大缓存
             old_cache = self.cache
@@ -542,7 +650,8 @@ class OptimizedStateManager:
         # 清理过期的索引项
         self._cleanup_expired_index_items()
         
-        print("✓ 缓存优化完成")
+        log_lines.append("✓ 缓存优化完成")
+        print("\n".join(log_lines))
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """获取性能摘要"""
@@ -572,19 +681,19 @@ class OptimizedStateManager:
         # 测试状态获取性能
         get_times = []
         for i in range(num_operations):
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.get_current_state()
-            get_times.append(time.time() - start_time)
+            get_times.append(time.perf_counter() - start_time)
         
         # 测试状态更新性能
         update_times = []
         for i in range(num_operations // 10):  # 更新操作较少
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.update_state({
                 'test_update': f'benchmark_{i}',
                 'timestamp': datetime.now().isoformat()
             })
-            update_times.append(time.time() - start_time)
+            update_times.append(time.perf_counter() - start_time)
         
         # 测试缓存性能
         cache_stats = self.cache.get_stats()
@@ -604,12 +713,15 @@ class OptimizedStateManager:
             'cache_efficiency': cache_stats['hit_rate'] * (1.0 / max(0.001, avg_get_time))
         }
         
-        print(f"✓ 基准测试完成:")
-        print(f"  - 平均获取时间: {avg_get_time:.6f}s")
-        print(f"  - 平均更新时间: {avg_update_time:.6f}s")
-        print(f"  - 每秒操作数: {benchmark_result['operations_per_second']:.1f}")
-        print(f"  - 缓存命中率: {cache_stats['hit_rate']:.2%}")
-        print(f"  - 性能等级: {performance_grade}")
+        # 摘要一次性输出，避免逐行写入
+        print("\n".join([
+            "✓ 基准测试完成:",
+            f"  - 平均获取时间: {avg_get_time:.6f}s",
+            f"  - 平均更新时间: {avg_update_time:.6f}s",
+            f"  - 每秒操作数: {benchmark_result['operations_per_second']:.1f}",
+            f"  - 缓存命中率: {cache_stats['hit_rate']:.2%}",
+            f"  - 性能等级: {performance_grade}"
+        ]))
         
         return benchmark_result
     
@@ -618,18 +730,8 @@ class OptimizedStateManager:
         self.current_state = {
             'project_id': self.project_id,
             'created_at': datetime.now().isoformat(),
-            'workflow_state': {
-                'current_stage': 'S1',
-                'stage_progress': 0.0,
-                'completed_stages': [],
-                'active_tasks': []
-            },
-            'project_context': {
-                'project_type': 'general',
-                'complexity': 'medium',
-                'team_size': 1,
-                'timeline': 'flexible'
-            },
+            'workflow_state': _from_template(_DEFAULT_WORKFLOW_STATE),
+            'project_context': _from_template(_DEFAULT_PROJECT_CONTEXT),
             'ai_memory': [],
             'user_preferences': {},
             'execution_history': []
@@ -639,23 +741,13 @@ class OptimizedStateManager:
         """获取项目上下文"""
         if self.current_state and 'project_context' in self.current_state:
             return self.current_state['project_context']
-        return {
-            'project_type': 'general',
-            'complexity': 'medium',
-            'team_size': 1,
-            'timeline': 'flexible'
-        }
+        return _from_template(_DEFAULT_PROJECT_CONTEXT)
     
     def _get_workflow_state(self) -> Dict[str, Any]:
         """获取工作流状态"""
         if self.current_state and 'workflow_state' in self.current_state:
             return self.current_state['workflow_state']
-        return {
-            'current_stage': 'S1',
-            'stage_progress': 0.0,
-            'completed_stages': [],
-            'active_tasks': []
-        }
+        return _from_template(_DEFAULT_WORKFLOW_STATE)
     
     def _get_ai_memory(self) -> List[Dict[str, Any]]:
         """获取AI记忆"""
@@ -740,11 +832,13 @@ class OptimizedStateManager:
     def _calculate_content_hash(self, state: Dict[str, Any]) -> str:
         """计算状态内容哈希"""
         # 移除时间戳等变化字段
-        hashable_state = state.copy()
-        hashable_state.pop('timestamp', None)
-        hashable_state.pop('last_updated', None)
+        hashable_state = {
+            key: value for key, value in state.items()
+            if key != 'timestamp' and key != 'last_updated'
+        }
         
-        content_str = json.dumps(hashable_state, sort_keys=True, ensure_ascii=False)
+        # 哈希只在内存索引中使用，紧凑分隔符即可，减少待编码和待哈希的字节数
+        content_str = json.dumps(hashable_state, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
         return hashlib.md5(content_str.encode()).hexdigest()
     
     def _calculate_state_similarity(self, state1: Dict[str, Any], state2: Dict[str, Any]) -> float:
@@ -761,17 +855,22 @@ class OptimizedStateManager:
         
         return matching_values / len(common_keys)
     
-    def _update_performance_stats(self, operation_time: float):
-        """更新性能统计"""
-        self.performance_stats['total_operations'] += 1
-        
-        # 更新平均操作时间
-        total_ops = self.performance_stats['total_operations']
-        current_avg = self.performance_stats['average_operation_time']
-        
-        self.performance_stats['average_operation_time'] = (
-            (current_avg * (total_ops - 1) + operation_time) / total_ops
-        )
+    def _count_operation(self, counter: str):
+        """累加操作计数"""
+        with self._stats_lock:
+            self.performance_stats[counter] += 1
+    
+    def _update_performance_stats(self, operation_time: float, counter: Optional[str] = None):
+        """更新性能统计，counter指定时同时累加对应的操作计数"""
+        stats = self.performance_stats
+        with self._stats_lock:
+            if counter is not None:
+                stats[counter] += 1
+            
+            # 更新操作总数和平均操作时间
+            total_ops = stats['total_operations'] + 1
+            stats['total_operations'] = total_ops
+            stats['average_operation_time'] += (operation_time - stats['average_operation_time']) / total_ops
     
     def _cleanup_expired_index_items(self):
         """清理过期的索引项"""
@@ -787,8 +886,7 @@ class OptimizedStateManager:
             except ValueError:
                 expired_hours.append(hour_key)  # 无效格式也清理
         
-        for hour_key in expired_hours:
-            self.index.timestamp_index.pop(hour_key, None)
+        self.index.drop_timestamp_buckets(expired_hours)
     
     def _load_state_and_index(self):
         """加载状态和索引"""
@@ -806,11 +904,10 @@ class OptimizedStateManager:
                 with open(self.index_file, 'r', encoding='utf-8') as f:
                     index_data = json.load(f)
                     # 重建索引，将列表转换为集合
-                    project_index_data = index_data.get('project_index', {})
-                    self.index.project_index = {k: set(v) for k, v in project_index_data.items()}
-                    
-                    tag_index_data = index_data.get('tag_index', {})
-                    self.index.tag_index = {k: set(v) for k, v in tag_index_data.items()}
+                    self.index.load_buckets(
+                        index_data.get('project_index', {}),
+                        index_data.get('tag_index', {})
+                    )
                     
         except Exception as e:
             print(f"⚠️ 加载状态失败: {e}")
@@ -819,26 +916,28 @@ class OptimizedStateManager:
     def _save_state(self):
         """保存状态和索引"""
         try:
+            saved_at = datetime.now().isoformat()
+            
             # 保存状态
             state_data = {
                 'current_state': self.current_state,
                 'state_history': self.state_history,
                 'performance_stats': self.performance_stats,
-                'last_saved': datetime.now().isoformat()
+                'last_saved': saved_at
             }
             
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state_data, f, ensure_ascii=False, indent=2)
+            # 状态文件仅供程序读取，调试模式下才缩进美化
+            pretty = self.config.debug_mode
+            write_json_file(self.state_file, state_data, pretty=pretty)
             
             # 保存索引
             index_data = {
                 'project_index': {k: list(v) for k, v in self.index.project_index.items()},
                 'tag_index': {k: list(v) for k, v in self.index.tag_index.items()},
-                'last_saved': datetime.now().isoformat()
+                'last_saved': saved_at
             }
             
-            with open(self.index_file, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, ensure_ascii=False, indent=2)
+            write_json_file(self.index_file, index_data, pretty=pretty)
                 
         except Exception as e:
             print(f"⚠️ 保存状态失败: {e}")
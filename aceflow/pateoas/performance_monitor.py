@@ -3,18 +3,21 @@ PATEOAS性能监控系统
 提供全面的性能跟踪、指标收集和警报功能
 """
 
+import sys
 import time
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from .config import get_config
-from .utils import ensure_directory
+from .utils import ensure_directory, compact_json_bytes, DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PerformanceMetric:
     """性能指标数据模型"""
     name: str
@@ -24,6 +27,21 @@ class PerformanceMetric:
     unit: str = ""
     threshold_warning: Optional[float] = None
     threshold_critical: Optional[float] = None
+    # 历史记录条目的JSON编码缓存，指标记录后不再修改
+    _encoded: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    
+    def to_history_json(self) -> bytes:
+        """编码为历史记录条目，结果缓存，后续保存直接复用"""
+        encoded = self._encoded
+        if encoded is None:
+            encoded = self._encoded = compact_json_bytes({
+                'name': self.name,
+                'value': self.value,
+                'timestamp': self.timestamp.isoformat(),
+                'category': self.category,
+                'unit': self.unit
+            })
+        return encoded
     
     def is_warning(self) -> bool:
         """检查是否达到警告阈值"""
@@ -34,7 +52,7 @@ class PerformanceMetric:
         return self.threshold_critical is not None and self.value >= self.threshold_critical
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ComponentPerformance:
     """组件性能数据"""
     component_name: str
@@ -45,7 +63,7 @@ class ComponentPerformance:
     average_time: float = 0.0
     min_time: float = float('inf')
     max_time: float = 0.0
-    last_call_time: Optional[datetime] = None
+    last_call_time: Optional[float] = None  # epoch秒，仅在输出摘要时格式化
     
     def add_call(self, execution_time: float, success: bool = True):
         """添加调用记录"""
@@ -59,7 +77,23 @@ class ComponentPerformance:
         self.average_time = self.total_time / self.total_calls
         self.min_time = min(self.min_time, execution_time)
         self.max_time = max(self.max_time, execution_time)
-        self.last_call_time = datetime.now()
+        self.last_call_time = time.time()
+    
+    def add_calls(self, execution_times: List[float], success_count: int):
+        """批量添加调用记录，统计量在整批数据上一次性更新"""
+        count = len(execution_times)
+        if not count:
+            return
+        
+        self.total_calls += count
+        self.successful_calls += success_count
+        self.failed_calls += count - success_count
+        
+        self.total_time += sum(execution_times)
+        self.average_time = self.total_time / self.total_calls
+        self.min_time = min(self.min_time, min(execution_times))
+        self.max_time = max(self.max_time, max(execution_times))
+        self.last_call_time = time.time()
     
     @property
     def success_rate(self) -> float:
@@ -72,6 +106,56 @@ class ComponentPerformance:
         return self.failed_calls / max(1, self.total_calls)
 
 
+class _MetricsHistoryWriter:
+    """指标历史后台写入器
+
+    周期性保存在后台线程写盘，同一文件积压的多份内容只写入最新一份
+    """
+    
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: Dict[Path, bytes] = {}
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+    
+    def submit(self, path: Path, payload: bytes):
+        """提交后台写入，已有待写内容时直接替换"""
+        with self._lock:
+            scheduled = path in self._pending
+            self._pending[path] = payload
+        if not scheduled:
+            self._executor.submit(self._flush, path)
+    
+    def write_now(self, path: Path, payload: bytes):
+        """立即写入，并丢弃该文件尚未写出的旧内容"""
+        with self._io_lock:
+            with self._lock:
+                self._pending.pop(path, None)
+            self._write(path, payload)
+    
+    def flush(self):
+        """等待已提交的后台写入全部完成"""
+        self._executor.submit(lambda: None).result()
+    
+    def _flush(self, path: Path):
+        with self._io_lock:
+            with self._lock:
+                payload = self._pending.pop(path, None)
+            if payload is not None:
+                self._write(path, payload)
+    
+    @staticmethod
+    def _write(path: Path, payload: bytes):
+        try:
+            with open(path, 'wb') as f:
+                f.write(payload)
+        except Exception as e:
+            print(f"保存性能指标历史失败: {e}")
+
+
+_history_writer = _MetricsHistoryWriter()
+
+
 class PATEOASPerformanceMonitor:
     """PATEOAS性能监控器"""
     
@@ -79,6 +163,9 @@ class PATEOASPerformanceMonitor:
         self.project_id = project_id
         self.config = get_config()
         
+        # 关闭性能监控时，计时和记录接口直接返回
+        self.enabled = self.config.performance_monitoring
+        
         # 性能数据存储
         self.metrics_history: List[PerformanceMetric] = []
         self.component_performance: Dict[str, ComponentPerformance] = {}
@@ -115,52 +202,91 @@ class PATEOASPerformanceMonitor:
     def start_operation(self, operation_name: str) -> str:
         """开始操作计时"""
         operation_id = f"{operation_name}_{int(time.time() * 1000)}"
+        if not self.enabled:
+            return operation_id
         self._operation_start_times = getattr(self, '_operation_start_times', {})
-        self._operation_start_times[operation_id] = time.time()
+        self._operation_start_times[operation_id] = time.perf_counter()
         return operation_id
     
     def end_operation(self, operation_id: str, component_name: str, success: bool = True):
         """结束操作计时并记录性能"""
-        start_times = getattr(self, '_operation_start_times', {})
-        if operation_id not in start_times:
+        start_time = getattr(self, '_operation_start_times', {}).pop(operation_id, None)
+        if start_time is None:
             return
         
-        execution_time = time.time() - start_times[operation_id]
-        del start_times[operation_id]
+        execution_time = time.perf_counter() - start_time
         
-        # 更新组件性能
-        if component_name not in self.component_performance:
-            self.component_performance[component_name] = ComponentPerformance(component_name)
-        
-        self.component_performance[component_name].add_call(execution_time, success)
+        # 组件性能、全局指标和性能指标在同一次更新中完成
+        self.record_operations(component_name, ((execution_time, success),))
+    
+    def record_operations(self, component_name: str, operations: Iterable[Tuple[float, bool]]):
+        """批量记录已完成操作的性能数据
+
+        operations 为 (执行时间, 是否成功) 序列，全局指标和系统健康分数只在批次结束时计算一次
+        """
+        if not self.enabled:
+            return
         
-        # 更新全局指标
-        self._update_global_metrics(execution_time, success)
+        operations = list(operations)
+        if not operations:
+            return
         
-        # 记录性能指标
-        self._record_metric(
-            name=f"{component_name}_execution_time",
-            value=execution_time,
-            category="performance",
-            unit="seconds"
-        )
+        component = self.component_performance.get(component_name)
+        if component is None:
+            component = self.component_performance[component_name] = ComponentPerformance(component_name)
+        
+        metrics = self.current_metrics
+        total_time = metrics['average_response_time'] * metrics['total_requests']
+        # 指标名按组件拼接，驻留后历史中的同名指标共享同一个字符串对象
+        metric_name = sys.intern(f"{component_name}_execution_time")
+        threshold_warning = self.alert_thresholds.get(f"{metric_name}_warning")
+        threshold_critical = self.alert_thresholds.get(f"{metric_name}_critical")
+        
+        execution_times = [execution_time for execution_time, _ in operations]
+        success_count = sum(1 for _, success in operations if success)
+        component.add_calls(execution_times, success_count)
+        
+        metrics['successful_requests'] += success_count
+        metrics['failed_requests'] += len(operations) - success_count
+        metrics['total_requests'] += len(operations)
+        metrics['average_response_time'] = (total_time + sum(execution_times)) / metrics['total_requests']
+        metrics['system_health_score'] = self._calculate_system_health()
+        
+        new_metrics = [
+            PerformanceMetric(
+                name=metric_name,
+                value=execution_time,
+                category="performance",
+                unit="seconds",
+                threshold_warning=threshold_warning,
+                threshold_critical=threshold_critical
+            )
+            for execution_time in execution_times
+        ]
+        self._append_metrics(new_metrics)
     
     def record_decision_accuracy(self, accuracy: float):
         """记录决策准确性"""
+        if not self.enabled:
+            return
         self.current_metrics['decision_accuracy'] = accuracy
         self._record_metric("decision_accuracy", accuracy, "quality", "ratio")
     
     def record_user_satisfaction(self, satisfaction: float):
         """记录用户满意度"""
+        if not self.enabled:
+            return
         self.current_metrics['user_satisfaction'] = satisfaction
         self._record_metric("user_satisfaction", satisfaction, "quality", "ratio")
     
     def record_memory_efficiency(self, efficiency: float):
         """记录记忆效率"""
+        if not self.enabled:
+            return
         self.current_metrics['memory_efficiency'] = efficiency
         self._record_metric("memory_efficiency", efficiency, "performance", "ratio")
     
-    def get_performance_summary(self) -> Dict[str, Any]:
+    def get_performance_summary(self, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """获取性能摘要"""
         return {
             'current_metrics': self.current_metrics.copy(),
@@ -169,39 +295,46 @@ class PATEOASPerformanceMonitor:
                     'success_rate': comp.success_rate,
                     'average_time': comp.average_time,
                     'total_calls': comp.total_calls,
-                    'last_call': comp.last_call_time.isoformat() if comp.last_call_time else None
+                    'last_call': (
+                        datetime.fromtimestamp(comp.last_call_time).isoformat()
+                        if comp.last_call_time else None
+                    )
                 }
                 for name, comp in self.component_performance.items()
             },
             'system_health': self._calculate_system_health(),
             'alerts': self._check_alerts(),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp or datetime.now().isoformat()
         }
     
     def get_metrics_history(self, hours: int = 24) -> List[Dict[str, Any]]:
         """获取指标历史"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
         
-        recent_metrics = [
-            {
+        # 指标按时间顺序追加，从尾部向前滑动到窗口边界即可，无需扫描全部历史
+        recent_metrics = []
+        for metric in reversed(self.metrics_history):
+            if metric.timestamp < cutoff_time:
+                break
+            recent_metrics.append({
                 'name': metric.name,
                 'value': metric.value,
                 'timestamp': metric.timestamp.isoformat(),
                 'category': metric.category,
                 'unit': metric.unit
-            }
-            for metric in self.metrics_history
-            if metric.timestamp >= cutoff_time
-        ]
+            })
+        recent_metrics.reverse()
         
         return recent_metrics
     
     def generate_performance_report(self) -> Dict[str, Any]:
         """生成性能报告"""
+        # 报告内的各部分共享同一个时间戳
+        report_timestamp = datetime.now().isoformat()
         report = {
-            'report_timestamp': datetime.now().isoformat(),
+            'report_timestamp': report_timestamp,
             'project_id': self.project_id,
-            'summary': self.get_performance_summary(),
+            'summary': self.get_performance_summary(timestamp=report_timestamp),
             'trends': self._analyze_performance_trends(),
             'recommendations': self._generate_performance_recommendations(),
             'component_analysis': self._analyze_component_performance(),
@@ -210,25 +343,6 @@ class PATEOASPerformanceMonitor:
         
         return report
     
-    def _update_global_metrics(self, execution_time: float, success: bool):
-        """更新全局指标"""
-        self.current_metrics['total_requests'] += 1
-        
-        if success:
-            self.current_metrics['successful_requests'] += 1
-        else:
-            self.current_metrics['failed_requests'] += 1
-        
-        # 更新平均响应时间
-        total_requests = self.current_metrics['total_requests']
-        current_avg = self.current_metrics['average_response_time']
-        self.current_metrics['average_response_time'] = (
-            (current_avg * (total_requests - 1) + execution_time) / total_requests
-        )
-        
-        # 更新系统健康分数
-        self.current_metrics['system_health_score'] = self._calculate_system_health()
-    
     def _record_metric(self, name: str, value: float, category: str, unit: str):
         """记录性能指标"""
         metric = PerformanceMetric(
@@ -240,15 +354,23 @@ class PATEOASPerformanceMonitor:
             threshold_critical=self.alert_thresholds.get(f"{name}_critical")
         )
         
-        self.metrics_history.append(metric)
+        self._append_metrics([metric])
+    
+    def _append_metrics(self, metrics: List[PerformanceMetric]):
+        """追加指标到历史记录"""
+        previous_size = len(self.metrics_history)
+        self.metrics_history.extend(metrics)
         
         # 保持历史记录在合理范围内
         if len(self.metrics_history) > 10000:
             self.metrics_history = self.metrics_history[-5000:]
+            previous_size = 0
         
-        # 定期保存
-        if len(self.metrics_history) % 100 == 0:
-            self._save_metrics_history()
+        # 定期保存（每跨过100条保存一次），写盘交给后台线程
+        if len(self.metrics_history) // 100 != previous_size // 100:
+            payload = self._encode_metrics_history()
+            if payload is not None:
+                _history_writer.submit(self.metrics_file, payload)
     
     def _calculate_system_health(self) -> float:
         """计算系统健康分数"""
@@ -333,9 +455,7 @@ class PATEOASPerformanceMonitor:
         # 按类别分组
         by_category = {}
         for metric in recent_metrics:
-            if metric.category not in by_category:
-                by_category[metric.category] = []
-            by_category[metric.category].append(metric)
+            by_category.setdefault(metric.category, []).append(metric)
         
         trends = {}
         for category, metrics in by_category.items():
@@ -395,10 +515,13 @@ class PATEOASPerformanceMonitor:
         analysis = {}
         
         for name, comp in self.component_performance.items():
+            # 成功率和效率每个组件只计算一次，评分与输出共用
+            success_rate = comp.success_rate
+            efficiency = 1.0 / max(0.1, comp.average_time)
             analysis[name] = {
-                'performance_score': min(1.0, comp.success_rate * (1.0 / max(0.1, comp.average_time))),
-                'reliability': comp.success_rate,
-                'efficiency': 1.0 / max(0.1, comp.average_time),
+                'performance_score': min(1.0, success_rate * efficiency),
+                'reliability': success_rate,
+                'efficiency': efficiency,
                 'usage_frequency': comp.total_calls,
                 'status': self._get_component_status(comp)
             }
@@ -407,11 +530,13 @@ class PATEOASPerformanceMonitor:
     
     def _get_component_status(self, comp: ComponentPerformance) -> str:
         """获取组件状态"""
-        if comp.success_rate >= 0.95 and comp.average_time <= 0.5:
+        success_rate = comp.success_rate
+        average_time = comp.average_time
+        if success_rate >= 0.95 and average_time <= 0.5:
             return 'excellent'
-        elif comp.success_rate >= 0.9 and comp.average_time <= 1.0:
+        elif success_rate >= 0.9 and average_time <= 1.0:
             return 'good'
-        elif comp.success_rate >= 0.8 and comp.average_time <= 2.0:
+        elif success_rate >= 0.8 and average_time <= 2.0:
             return 'fair'
         else:
             return 'poor'
@@ -430,12 +555,13 @@ class PATEOASPerformanceMonitor:
                     
                 # 恢复指标历史
                 for metric_data in data.get('metrics_history', []):
+                    # 名称、类别和单位取值很少，驻留后数千条历史指标共享字符串
                     metric = PerformanceMetric(
-                        name=metric_data['name'],
+                        name=sys.intern(metric_data['name']),
                         value=metric_data['value'],
                         timestamp=datetime.fromisoformat(metric_data['timestamp']),
-                        category=metric_data.get('category', 'general'),
-                        unit=metric_data.get('unit', '')
+                        category=sys.intern(metric_data.get('category', 'general')),
+                        unit=sys.intern(metric_data.get('unit', ''))
                     )
                     self.metrics_history.append(metric)
                 
@@ -448,24 +574,24 @@ class PATEOASPerformanceMonitor:
     
     def _save_metrics_history(self):
         """保存指标历史"""
+        payload = self._encode_metrics_history()
+        if payload is not None:
+            _history_writer.write_now(self.metrics_file, payload)
+    
+    def _encode_metrics_history(self) -> Optional[bytes]:
+        """在调用线程中生成指标历史快照的UTF-8 JSON"""
         try:
-            data = {
+            # 只有当前指标需要重新编码；历史条目复用各自缓存的编码，直接拼接
+            head = compact_json_bytes({
                 'current_metrics': self.current_metrics,
-                'metrics_history': [
-                    {
-                        'name': metric.name,
-                        'value': metric.value,
-                        'timestamp': metric.timestamp.isoformat(),
-                        'category': metric.category,
-                        'unit': metric.unit
-                    }
-                    for metric in self.metrics_history[-1000:]  # 只保存最近1000条
-                ],
                 'last_updated': datetime.now().isoformat()
-            }
-            
-            with open(self.metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            })
+            history = b','.join(
+                metric.to_history_json()
+                for metric in self.metrics_history[-1000:]  # 只保存最近1000条
+            )
+            return b''.join((head[:-1], b',"metrics_history":[', history, b']}'))
                 
         except Exception as e:
-            print(f"保存性能指标历史失败: {e}")
\ No newline at end of file
+            print(f"保存性能指标历史失败: {e}")
+            return None
\ No newline at end of file
@@ -4,11 +4,23 @@
 """
 
 from enum import Enum
+from types import MappingProxyType
+from collections import deque
 from dataclasses import dataclass
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from .models import MemoryFragment, MemoryCategory
 
+# 调整前的基础质量阈值，调整时在副本上修改
+_BASE_QUALITY_THRESHOLDS = MappingProxyType({
+    'completeness': 0.8,
+    'accuracy': 0.75,
+    'consistency': 0.7,
+    'feasibility': 0.7,
+    'testability': 0.65,
+    'maintainability': 0.7
+})
+
 
 class QualityDimension(Enum):
     """质量维度枚举"""
@@ -50,7 +62,8 @@ class ContextAwareQualityAssessment:
     """上下文感知质量评估器"""
     
     def __init__(self):
-        self.assessment_history = []
+        # 有界队列：超出容量时自动丢弃最旧记录，无需每次追加后切片复制
+        self.assessment_history: deque = deque(maxlen=100)
         self.context_patterns = {}
         self.adaptation_rules = self._initialize_adaptation_rules()
     
@@ -248,16 +261,7 @@ class ContextAwareQualityAssessment:
     def _adjust_quality_thresholds(self, context_analysis: Dict[str, Any]) -> Dict[str, float]:
         """基于上下文调整质量阈值"""
         
-        base_thresholds = {
-            'completeness': 0.8,
-            'accuracy': 0.75,
-            'consistency': 0.7,
-            'feasibility': 0.7,
-            'testability': 0.65,
-            'maintainability': 0.7
-        }
-        
-        adjusted_thresholds = base_thresholds.copy()
+        adjusted_thresholds = _BASE_QUALITY_THRESHOLDS.copy()
         
         # 基于团队经验调整
         team_exp = context_analysis.get('team_experience', 'medium')
@@ -337,7 +341,7 @@ class ContextAwareQualityAssessment:
             adjustment += self.adaptation_rules['team_experience'][team_exp]['score_boost']
         
         # 基于历史性能调整
-        historical_perf = context_analysis.get('historical_performance', {})
+        historical_perf = context_analysis['historical_performance']
         success_rate = historical_perf.get('success_rate', 0.5)
         if success_rate > 0.7:
             adjustment += 0.05
@@ -367,7 +371,7 @@ class ContextAwareQualityAssessment:
         memory_count_factor = min(1.0, len(memories) / 10.0)
         
         # 基于历史性能置信度调整
-        historical_confidence = context_analysis.get('historical_performance', {}).get('confidence', 0.5)
+        historical_confidence = context_analysis['historical_performance'].get('confidence', 0.5)
         
         # 基于上下文完整性调整
         context_completeness = len([v for v in context_analysis.values() if v is not None]) / len(context_analysis)
@@ -568,7 +572,7 @@ class ContextAwareQualityAssessment:
         if technical_debt > 0.7:
             risks.append("技术债务过高，影响长期可维护性")
         
-        historical_perf = context_analysis.get('historical_performance', {})
+        historical_perf = context_analysis['historical_performance']
         if historical_perf.get('success_rate', 0.5) < 0.4:
             risks.append("历史成功率较低，需要关注项目执行风险")
         
@@ -736,14 +740,10 @@ class ContextAwareQualityAssessment:
         }
         
         self.assessment_history.append(history_entry)
-        
-        # 保持历史记录在合理范围内
-        if len(self.assessment_history) > 100:
-            self.assessment_history = self.assessment_history[-100:]
     
     def get_assessment_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """获取评估历史"""
-        return self.assessment_history[-limit:]
+        return list(self.assessment_history)[-limit:]
     
     def get_quality_trends(self) -> Dict[str, Any]:
         """获取质量趋势分析"""
@@ -751,8 +751,9 @@ class ContextAwareQualityAssessment:
         if len(self.assessment_history) < 2:
             return {'trend': 'insufficient_data'}
         
-        recent_scores = [entry['overall_score'] for entry in self.assessment_history[-5:]]
-        older_scores = [entry['overall_score'] for entry in self.assessment_history[-10:-5]]
+        history = list(self.assessment_history)
+        recent_scores = [entry['overall_score'] for entry in history[-5:]]
+        older_scores = [entry['overall_score'] for entry in history[-10:-5]]
         
         if not older_scores:
             return {'trend': 'insufficient_data'}
@@ -5,14 +5,44 @@
 
 import json
 import os
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 
 from .models import PATEOASState, StateTransition, MemoryFragment, NextAction, ActionType
 from .config import get_config
 from .utils import generate_id, safe_json_loads, safe_json_dumps, ensure_directory
 
+# 字段缓存的未命中标记，区分已构建为 None 的字段
+_MISSING = object()
+
+
+class _LazyStateDeclaration(Mapping):
+    """惰性状态声明，各字段在首次访问时才构建并缓存"""
+    
+    __slots__ = ('_factories', '_values')
+    
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self._factories = factories
+        self._values: Dict[str, Any] = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._values[key] = self._factories[key]()
+        return value
+    
+    def __iter__(self):
+        return iter(self._factories)
+    
+    def __len__(self) -> int:
+        return len(self._factories)
+    
+    def materialize(self) -> Dict[str, Any]:
+        """构建全部字段，返回完整的状态声明字典"""
+        return {key: self[key] for key in self._factories}
+
 
 class StateContinuityManager:
     """状态连续性管理器"""
@@ -73,44 +103,47 @@ class StateContinuityManager:
     
     def generate_state_declaration(self) -> Dict[str, Any]:
         """生成当前状态声明（PATEOAS核心）"""
+        return self.state_declaration_view().materialize()
+    
+    def state_declaration_view(self) -> _LazyStateDeclaration:
+        """生成惰性状态声明，只读取部分字段的调用方无需构建完整声明"""
         if not self.current_state:
             self._initialize_default_state()
         
-        # 获取相关记忆并按重要性排序
-        relevant_memories = self.current_state.get_relevant_memories(10)
-        
-        # 生成智能的下一步建议
-        smart_suggestions = self._generate_smart_suggestions()
-        
-        # 生成上下文感知的状态摘要
-        context_summary = self._generate_context_summary()
-        
-        return {
-            'current_task': self.current_state.current_task,
-            'progress': self.current_state.task_progress,
-            'stage_info': {
-                'current_stage': self.current_state.stage_context.get('current_stage', 'unknown'),
-                'workflow_mode': self.current_state.stage_context.get('workflow_mode', 'smart'),
-                'completed_stages': self.current_state.stage_context.get('completed_stages', []),
-                'pending_tasks': self.current_state.stage_context.get('pending_tasks', [])
+        state = self.current_state
+        # 声明内各生成器共用同一时刻，避免每个字段、每条记忆各读一次时钟
+        now = datetime.now()
+        timestamp = now.isoformat()
+        
+        return _LazyStateDeclaration({
+            'current_task': lambda: state.current_task,
+            'progress': lambda: state.task_progress,
+            'stage_info': lambda: {
+                'current_stage': state.stage_context.get('current_stage', 'unknown'),
+                'workflow_mode': state.stage_context.get('workflow_mode', 'smart'),
+                'completed_stages': state.stage_context.get('completed_stages', []),
+                'pending_tasks': state.stage_context.get('pending_tasks', [])
             },
-            'memory_fragments': [
+            # 获取相关记忆并按重要性排序
+            'memory_fragments': lambda: [
                 {
                     'content': m.content,
                     'category': m.category.value,
                     'importance': m.importance,
                     'tags': m.tags,
-                    'relevance_score': self._calculate_memory_relevance(m)
-                } for m in relevant_memories
+                    'relevance_score': self._calculate_memory_relevance(m, now)
+                } for m in state.get_relevant_memories(10)
             ],
-            'context_summary': context_summary,
-            'next_suggestions': smart_suggestions,
-            'alternative_paths': self._generate_alternative_paths(),
-            'meta_cognition': self._generate_enhanced_meta_cognition(),
-            'state_health': self._assess_state_health(),
-            'timestamp': datetime.now().isoformat(),
-            'state_id': f"{self.project_id}_{self.current_state.iteration_id}"
-        }
+            # 生成上下文感知的状态摘要
+            'context_summary': self._generate_context_summary,
+            # 生成智能的下一步建议
+            'next_suggestions': self._generate_smart_suggestions,
+            'alternative_paths': self._generate_alternative_paths,
+            'meta_cognition': self._generate_enhanced_meta_cognition,
+            'state_health': lambda: self._assess_state_health(now),
+            'timestamp': lambda: timestamp,
+            'state_id': lambda: f"{self.project_id}_{state.iteration_id}"
+        })
     
     def add_memory(self, content: str, category: str, importance: float = 0.5, tags: List[str] = None):
         """添加记忆片段"""
@@ -397,6 +430,7 @@ class StateContinuityManager:
         if not self.current_state:
             return {}
         
+        now = datetime.now()
         return {
             'project_info': {
                 'project_id': self.project_id,
@@ -412,7 +446,7 @@ class StateContinuityManager:
             'activity_summary': {
                 'total_transitions': len(self.current_state.transition_history),
                 'recent_activity': len([t for t in self.current_state.transition_history 
-                                     if (datetime.now() - t.timestamp).days < 7]),
+                                     if (now - t.timestamp).days < 7]),
                 'success_rate': sum(1 for t in self.current_state.transition_history if t.success) / 
                                max(1, len(self.current_state.transition_history))
             },
@@ -723,8 +757,10 @@ class StateContinuityManager:
         
         return enhanced_meta
     
-    def _assess_state_health(self) -> Dict[str, Any]:
-        """评估状态健康度"""
+    def _assess_state_health(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """评估状态健康度，now 由调用方传入时与状态声明共用同一时间戳"""
+        if now is None:
+            now = datetime.now()
         health_score = 0.0
         health_factors = {}
         recommendations = []
@@ -785,7 +821,7 @@ class StateContinuityManager:
         
         # 评估活跃度
         recent_activity = len([t for t in self.current_state.transition_history 
-                             if (datetime.now() - t.timestamp).days < 1])
+                             if (now - t.timestamp).days < 1])
         if recent_activity > 5:
             health_factors['activity'] = 'very_active'
             health_score += 0.15
@@ -814,10 +850,10 @@ class StateContinuityManager:
             'health_score': health_score,
             'health_factors': health_factors,
             'recommendations': recommendations,
-            'last_assessment': datetime.now().isoformat()
+            'last_assessment': now.isoformat()
         }
     
-    def _calculate_memory_relevance(self, memory: MemoryFragment) -> float:
+    def _calculate_memory_relevance(self, memory: MemoryFragment, now: Optional[datetime] = None) -> float:
         """计算记忆相关性分数"""
         relevance = memory.importance
         
@@ -828,7 +864,7 @@ class StateContinuityManager:
             relevance += 0.05
         
         # 基于时间衰减
-        days_old = (datetime.now() - memory.created_at).days
+        days_old = ((now or datetime.now()) - memory.created_at).days
         if days_old < 1:
             relevance += 0.1
         elif days_old < 7:
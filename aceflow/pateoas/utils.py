@@ -6,10 +6,32 @@ PATEOAS 工具函数
 import json
 import hashlib
 import re
+import sys
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 
+# dataclass(slots=True) 仅在 Python 3.10+ 可用，低版本回退为普通 dataclass
+DATACLASS_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+# 响应时间戳的复用粒度（秒）
+_NOW_ISO_GRANULARITY = 1.0
+_now_iso_cache = (float('-inf'), '')
+
+
+def now_iso() -> str:
+    """当前时间的ISO字符串，粒度内复用同一结果，用于无需高精度的响应时间戳"""
+    global _now_iso_cache
+    checked_at, iso = _now_iso_cache
+    current = time.monotonic()
+    if current - checked_at >= _NOW_ISO_GRANULARITY:
+        iso = datetime.now().isoformat()
+        _now_iso_cache = (current, iso)
+    return iso
+
 
 def generate_id(prefix: str = "", content: str = "") -> str:
     """生成唯一ID"""
@@ -85,11 +107,11 @@ def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
         '的', '了', '在', '是', '有', '和', '或', '但', '这', '那', '我', '你', '他'
     }
     
-    # 统计词频
-    word_freq = {}
+    # 统计词频，defaultdict 省去每次计数的 get 查找
+    word_freq = defaultdict(int)
     for word in words:
         if len(word) > 2 and word not in stop_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
+            word_freq[word] += 1
     
     # 按频率排序并返回前N个
     sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
@@ -127,11 +149,44 @@ def safe_json_loads(json_str: str, default: Any = None) -> Any:
 def safe_json_dumps(obj: Any, default: str = "{}") -> str:
     """安全的JSON序列化"""
     try:
-        return json.dumps(obj, ensure_ascii=False, indent=2)
+        return pretty_json_dumps(obj)
     except (TypeError, ValueError):
         return default
 
 
+# 以下编码函数统一使用标准库json：输出不随可选依赖变化，
+# NaN/Infinity 可原样读回，datetime 等非JSON类型一律抛出 TypeError
+
+def pretty_json_dumps(obj: Any) -> str:
+    """缩进两格的JSON序列化，用于展示输出"""
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def compact_json_dumps(obj: Any) -> str:
+    """紧凑JSON序列化"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def compact_json_bytes(obj: Any) -> bytes:
+    """紧凑JSON序列化为UTF-8字节，写文件时无需再次编码"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_json_file(path: Union[str, Path], data: Any, pretty: bool = False) -> None:
+    """写入JSON文件，默认紧凑输出，仅在需要人工查看时缩进美化"""
+    if pretty:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    else:
+        with open(path, 'wb') as f:
+            f.write(compact_json_bytes(data))
+
+
+def intern_tags(tags: List[str]) -> List[str]:
+    """驻留标签字符串，加载的大量记忆共享同一份标签对象"""
+    return [sys.intern(tag) for tag in tags]
+
+
 def ensure_directory(path: Union[str, Path]) -> Path:
     """确保目录存在"""
     path_obj = Path(path)
@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 from .models import MemoryFragment, MemoryCategory
-from .utils import is_recent
+from .utils import is_recent, DATACLASS_SLOTS
 
 
 class OptimizationStrategy(Enum):
@@ -28,7 +28,7 @@ class WorkflowMode(Enum):
     SMART = "smart"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OptimizationContext:
     """优化上下文"""
     current_stage: str
@@ -40,7 +40,7 @@ class OptimizationContext:
     user_preferences: Dict[str, Any] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class WorkflowRecommendation:
     """工作流推荐"""
     recommended_mode: WorkflowMode
@@ -96,16 +96,30 @@ class WorkflowOptimizer:
     ) -> Dict[str, Any]:
         """分析当前状态"""
         
+        # 一次性按类别分组，避免各分析步骤重复过滤整个记忆列表
+        memories_by_category = self._group_memories_by_category(memories)
+        
         analysis = {
-            'bottlenecks': self._identify_bottlenecks(context, memories),
-            'efficiency_metrics': self._calculate_efficiency_metrics(context, memories),
-            'risk_factors': self._identify_risk_factors(context, memories),
-            'optimization_opportunities': self._identify_optimization_opportunities(memories),
-            'quality_indicators': self._analyze_quality_indicators(memories)
+            'memories_by_category': memories_by_category,
+            'bottlenecks': self._identify_bottlenecks(context, memories_by_category),
+            'efficiency_metrics': self._calculate_efficiency_metrics(context, memories, memories_by_category),
+            'risk_factors': self._identify_risk_factors(context, memories_by_category),
+            'optimization_opportunities': self._identify_optimization_opportunities(memories_by_category),
+            'quality_indicators': self._analyze_quality_indicators(memories_by_category)
         }
         
         return analysis
     
+    def _group_memories_by_category(
+        self, 
+        memories: List[MemoryFragment]
+    ) -> Dict[MemoryCategory, List[MemoryFragment]]:
+        """按类别对记忆进行分组"""
+        grouped = {category: [] for category in MemoryCategory}
+        for memory in memories:
+            grouped[memory.category].append(memory)
+        return grouped
+    
     def _determine_optimization_strategy(
         self, 
         context: OptimizationContext, 
@@ -181,7 +195,7 @@ class WorkflowOptimizer:
             optimizations['time_saving_estimate'] += 0.3
         
         # 自动化机会
-        if any(m.category == MemoryCategory.PATTERN for m in memories):
+        if state_analysis['memories_by_category'][MemoryCategory.PATTERN]:
             optimizations['automation_opportunities'].extend([
                 'automated_testing',
                 'code_generation',
@@ -218,7 +232,7 @@ class WorkflowOptimizer:
         ])
         
         # 基于历史问题的审查流程
-        issue_memories = [m for m in memories if m.category == MemoryCategory.ISSUE]
+        issue_memories = state_analysis['memories_by_category'][MemoryCategory.ISSUE]
         if len(issue_memories) > 3:
             optimizations['review_processes'].extend([
                 'peer_review',
@@ -278,7 +292,7 @@ class WorkflowOptimizer:
         }
         
         # 基于历史学习的优化
-        learning_memories = [m for m in memories if m.category == MemoryCategory.LEARNING]
+        learning_memories = state_analysis['memories_by_category'][MemoryCategory.LEARNING]
         if learning_memories:
             optimizations['learning_based_optimizations'].extend([
                 'apply_learned_patterns',
@@ -316,7 +330,7 @@ class WorkflowOptimizer:
         
         return optimizations
     
-    def _identify_bottlenecks(self, context, memories) -> List[str]:
+    def _identify_bottlenecks(self, context, memories_by_category) -> List[str]:
         """识别瓶颈"""
         bottlenecks = []
         
@@ -329,19 +343,19 @@ class WorkflowOptimizer:
             bottlenecks.append('limited_development_time')
         
         # 基于历史问题
-        issue_memories = [m for m in memories if m.category == MemoryCategory.ISSUE]
+        issue_memories = memories_by_category[MemoryCategory.ISSUE]
         if len(issue_memories) > 3:
             bottlenecks.append('recurring_issues')
         
         # 基于决策延迟
-        decision_memories = [m for m in memories if m.category == MemoryCategory.DECISION]
+        decision_memories = memories_by_category[MemoryCategory.DECISION]
         recent_decisions = [m for m in decision_memories if is_recent(m.created_at, hours=7*24)]
         if len(recent_decisions) < 2 and context.current_stage in ['S1', 'S2']:
             bottlenecks.append('decision_delays')
         
         return bottlenecks
     
-    def _calculate_efficiency_metrics(self, context, memories) -> Dict[str, float]:
+    def _calculate_efficiency_metrics(self, context, memories, memories_by_category) -> Dict[str, float]:
         """计算效率指标"""
         # 基于进度和时间的效率计算
         time_efficiency = context.project_progress / max(0.1, context.time_constraints.get('elapsed_ratio', 0.5))
@@ -351,7 +365,7 @@ class WorkflowOptimizer:
         memory_efficiency = len(high_importance_memories) / max(1, len(memories))
         
         # 基于问题解决的效率
-        issue_memories = [m for m in memories if m.category == MemoryCategory.ISSUE]
+        issue_memories = memories_by_category[MemoryCategory.ISSUE]
         resolved_issues = len([m for m in issue_memories if 'resolved' in m.content.lower() or '解决' in m.content])
         issue_resolution_efficiency = resolved_issues / max(1, len(issue_memories))
         
@@ -364,7 +378,7 @@ class WorkflowOptimizer:
             'overall_efficiency': min(1.0, overall_efficiency)
         }
     
-    def _identify_risk_factors(self, context, memories) -> List[str]:
+    def _identify_risk_factors(self, context, memories_by_category) -> List[str]:
         """识别风险因素"""
         risks = []
         
@@ -373,7 +387,7 @@ class WorkflowOptimizer:
             risks.append('tight_deadline')
         
         # 质量风险
-        issue_memories = [m for m in memories if m.category == MemoryCategory.ISSUE]
+        issue_memories = memories_by_category[MemoryCategory.ISSUE]
         if len(issue_memories) > 5:
             risks.append('quality_concerns')
         
@@ -382,18 +396,18 @@ class WorkflowOptimizer:
             risks.append('resource_constraints')
         
         # 技术风险
-        learning_memories = [m for m in memories if m.category == MemoryCategory.LEARNING]
+        learning_memories = memories_by_category[MemoryCategory.LEARNING]
         if len(learning_memories) < 2 and context.current_stage > 'S2':
             risks.append('insufficient_technical_knowledge')
         
         return risks
     
-    def _identify_optimization_opportunities(self, memories) -> List[str]:
+    def _identify_optimization_opportunities(self, memories_by_category) -> List[str]:
         """识别优化机会"""
         opportunities = []
         
         # 基于模式记忆的优化机会
-        pattern_memories = [m for m in memories if m.category == MemoryCategory.PATTERN]
+        pattern_memories = memories_by_category[MemoryCategory.PATTERN]
         if pattern_memories:
             opportunities.extend([
                 'leverage_identified_patterns',
@@ -402,7 +416,7 @@ class WorkflowOptimizer:
             ])
         
         # 基于学习记忆的优化机会
-        learning_memories = [m for m in memories if m.category == MemoryCategory.LEARNING]
+        learning_memories = memories_by_category[MemoryCategory.LEARNING]
         if learning_memories:
             opportunities.extend([
                 'apply_learned_best_practices',
@@ -411,17 +425,17 @@ class WorkflowOptimizer:
             ])
         
         # 基于决策记忆的优化机会
-        decision_memories = [m for m in memories if m.category == MemoryCategory.DECISION]
+        decision_memories = memories_by_category[MemoryCategory.DECISION]
         tech_decisions = [m for m in decision_memories if any(tech in m.content.lower() for tech in ['技术', 'technology', 'framework', '框架'])]
         if len(tech_decisions) > 2:
             opportunities.append('optimize_technology_stack')
         
         return opportunities
     
-    def _analyze_quality_indicators(self, memories) -> Dict[str, Any]:
+    def _analyze_quality_indicators(self, memories_by_category) -> Dict[str, Any]:
         """分析质量指标"""
-        issue_memories = [m for m in memories if m.category == MemoryCategory.ISSUE]
-        decision_memories = [m for m in memories if m.category == MemoryCategory.DECISION]
+        issue_memories = memories_by_category[MemoryCategory.ISSUE]
+        decision_memories = memories_by_category[MemoryCategory.DECISION]
         
         return {
             'issues': issue_memories,
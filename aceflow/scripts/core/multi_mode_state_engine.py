@@ -80,6 +80,10 @@ class MultiModeStateEngine:
         self.flow_modes = self._load_flow_modes()
         self.current_mode = FlowMode(self.config.get('flow', {}).get('mode', 'minimal'))
         
+        # 阶段定义只依赖 flow_modes 配置，按模式缓存解析结果
+        self._stages_cache: Dict[FlowMode, List[StageInfo]] = {}
+        self._stage_index_cache: Dict[FlowMode, Dict[str, StageInfo]] = {}
+        
         # 初始化状态
         self.state = self._load_state()
         
@@ -163,6 +167,14 @@ class MultiModeStateEngine:
     
     def get_stages_for_mode(self, mode: FlowMode) -> List[StageInfo]:
         """获取指定模式的阶段列表"""
+        if mode not in self._stages_cache:
+            stages = self._build_stages_for_mode(mode)
+            self._stages_cache[mode] = stages
+            self._stage_index_cache[mode] = {stage.id: stage for stage in stages}
+        return list(self._stages_cache[mode])
+    
+    def _build_stages_for_mode(self, mode: FlowMode) -> List[StageInfo]:
+        """根据流程模式配置构建阶段列表"""
         if not self.flow_modes or 'flow_modes' not in self.flow_modes:
             return []
         
@@ -190,11 +202,7 @@ class MultiModeStateEngine:
         if not self.state.get('current_stage'):
             return None
         
-        stages = self.get_stages_for_mode(self.current_mode)
-        for stage in stages:
-            if stage.id == self.state['current_stage']:
-                return stage
-        return None
+        return self._get_stage_info_by_id(self.state['current_stage'])
     
     def get_stage_state(self, stage_id: str) -> StageState:
         """获取阶段状态"""
@@ -297,11 +305,8 @@ class MultiModeStateEngine:
     
     def _get_stage_info_by_id(self, stage_id: str) -> Optional[StageInfo]:
         """根据ID获取阶段信息"""
-        stages = self.get_stages_for_mode(self.current_mode)
-        for stage in stages:
-            if stage.id == stage_id:
-                return stage
-        return None
+        self.get_stages_for_mode(self.current_mode)
+        return self._stage_index_cache[self.current_mode].get(stage_id)
     
     def _check_dependencies(self, stage_id: str) -> bool:
         """检查阶段依赖"""
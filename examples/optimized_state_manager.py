@@ -8,6 +8,12 @@ import time
 from datetime import datetime, timedelta
 from aceflow.pateoas.optimized_state_manager import OptimizedStateManager
 
+try:
+    import uvloop
+except ImportError:
+    # 没有uvloop时异步演示使用asyncio默认事件循环
+    uvloop = None
+
 
 def demo_basic_optimization():
     """演示基础优化功能"""
@@ -140,6 +146,8 @@ def demo_async_operations():
         return True
     
     # 运行异步演示
+    if uvloop is not None:
+        uvloop.install()
     result = asyncio.run(async_demo())
     print(f"✓ 异步操作演示完成")
 
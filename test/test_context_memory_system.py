@@ -12,7 +12,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 # 添加 pateoas 模块路径
-sys.path.insert(0, str(Path(__file__).parent))
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
 
 from pateoas.memory_system import ContextMemorySystem
 from pateoas.models import MemoryCategory
@@ -72,6 +74,14 @@ class TestContextMemorySystem(unittest.TestCase):
         self.assertEqual(memory['importance'], importance)
         self.assertEqual(memory['tags'], tags)
     
+    def test_add_memory_unknown_category(self):
+        """测试未知分类的记忆归入上下文分类"""
+        self.memory_system.add_memory("未知分类的记忆内容", "unknown_category", 0.6, ["未知"])
+        
+        memories = self.memory_system.search_memories("未知分类", limit=1)
+        self.assertEqual(len(memories), 1)
+        self.assertEqual(memories[0]['category'], MemoryCategory.CONTEXT.value)
+    
     def test_add_memory_different_categories(self):
         """测试不同类别的记忆添加"""
         test_memories = [
@@ -12,7 +12,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 # 添加 pateoas 模块路径
-sys.path.insert(0, str(Path(__file__).parent))
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
 
 from pateoas.decision_gates import (
     OptimizedDG1, OptimizedDG2, DecisionGateResult, DecisionGateEvaluation,
@@ -68,18 +70,20 @@ class TestDecisionGateResults(unittest.TestCase):
 class TestOptimizedDG1(unittest.TestCase):
     """OptimizedDG1 决策门测试"""
     
-    def setUp(self):
-        """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.original_cwd = os.getcwd()
-        os.chdir(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        """测试前准备（决策门评估不修改自身状态，整个测试类共享一个实例）"""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.original_cwd = os.getcwd()
+        os.chdir(cls.temp_dir)
         
-        self.dg1 = OptimizedDG1()
+        cls.dg1 = OptimizedDG1()
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """测试后清理"""
-        os.chdir(self.original_cwd)
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        os.chdir(cls.original_cwd)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
     
     def test_initialization(self):
         """测试DG1初始化"""
@@ -313,18 +317,20 @@ class TestOptimizedDG1(unittest.TestCase):
 class TestOptimizedDG2(unittest.TestCase):
     """OptimizedDG2 决策门测试"""
     
-    def setUp(self):
-        """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.original_cwd = os.getcwd()
-        os.chdir(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        """测试前准备（决策门评估不修改自身状态，整个测试类共享一个实例）"""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.original_cwd = os.getcwd()
+        os.chdir(cls.temp_dir)
         
-        self.dg2 = OptimizedDG2()
+        cls.dg2 = OptimizedDG2()
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """测试后清理"""
-        os.chdir(self.original_cwd)
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        os.chdir(cls.original_cwd)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
     
     def test_initialization(self):
         """测试DG2初始化"""
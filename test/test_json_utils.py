@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+测试JSON编码工具函数
+"""
+
+import sys
+import os
+import json
+import math
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# 添加 aceflow 模块路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'aceflow'))
+
+from aceflow.pateoas.utils import (
+    compact_json_dumps, compact_json_bytes, pretty_json_dumps, safe_json_dumps, write_json_file
+)
+from aceflow.pateoas.performance_monitor import PerformanceMetric
+
+
+def test_encoders_match_stdlib():
+    """测试各编码函数与标准库json输出一致"""
+    data = {'名称': '测试', 'value': 1.5, 1: [True, None]}
+
+    assert compact_json_dumps(data) == json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    assert compact_json_bytes(data) == compact_json_dumps(data).encode('utf-8')
+    assert pretty_json_dumps(data) == json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def test_non_finite_floats_round_trip():
+    """测试NaN和Infinity写入文件后可原样读回"""
+    data = {'nan': float('nan'), 'inf': float('inf')}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for pretty in (False, True):
+            path = Path(temp_dir) / f"data_{pretty}.json"
+            write_json_file(path, data, pretty=pretty)
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            assert math.isnan(loaded['nan'])
+            assert loaded['inf'] == float('inf')
+
+    metric = PerformanceMetric('response_time', float('nan'))
+    assert math.isnan(json.loads(metric.to_history_json())['value'])
+
+
+def test_non_json_types_are_rejected():
+    """测试datetime等非JSON类型统一抛出TypeError"""
+    data = {'timestamp': datetime.now()}
+
+    for encode in (compact_json_dumps, compact_json_bytes, pretty_json_dumps):
+        try:
+            encode(data)
+            assert False, "datetime应无法直接序列化"
+        except TypeError:
+            pass
+
+    assert safe_json_dumps(data) == "{}"
+
+
+if __name__ == "__main__":
+    test_encoders_match_stdlib()
+    test_non_finite_floats_round_trip()
+    test_non_json_types_are_rejected()
+    print("✓ JSON编码工具测试通过")
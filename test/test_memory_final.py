@@ -97,7 +97,8 @@ def test_memory_system():
         print("\n记忆访问测试:")
         before_search = req_memories[0].access_count if req_memories else 0
         memory_system.recall_relevant_context("登录需求", {}, limit=1)
-        after_search = req_store.get_all_memories()[0].access_count if req_store.get_all_memories() else 0
+        req_memories_after = req_store.get_all_memories()
+        after_search = req_memories_after[0].access_count if req_memories_after else 0
         print(f"  访问前计数: {before_search}, 访问后计数: {after_search}")
         
         # 7. 测试记忆模式分析
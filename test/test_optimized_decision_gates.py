@@ -108,6 +108,10 @@ def create_test_memories() -> list:
     return memories
 
 
+# 决策门评估不会修改记忆片段，所有测试共享同一组测试记忆
+_TEST_MEMORIES = create_test_memories()
+
+
 def test_optimized_dg1():
     """测试优化的DG1决策门"""
     
@@ -118,7 +122,7 @@ def test_optimized_dg1():
     print(f"✓ 创建DG1实例: {dg1.name}")
     
     # 准备测试数据
-    memories = create_test_memories()
+    memories = list(_TEST_MEMORIES)
     
     # 测试场景1：项目准备充分的情况
     print("\n场景1: 项目准备充分")
@@ -192,7 +196,7 @@ def test_optimized_dg2():
     print(f"✓ 创建DG2实例: {dg2.name}")
     
     # 准备测试数据
-    memories = create_test_memories()
+    memories = list(_TEST_MEMORIES)
     
     # 添加一些开发阶段的记忆
     base_time = datetime.now()
@@ -298,7 +302,7 @@ def test_decision_gate_manager():
     print("✓ 注册DG1和DG2决策门")
     
     # 准备测试数据
-    memories = create_test_memories()
+    memories = list(_TEST_MEMORIES)
     current_state = {
         'current_stage': 'S2',
         'task_progress': 0.8,
@@ -391,7 +395,7 @@ def test_adaptive_thresholds():
     print("\n=== 测试自适应阈值调整 ===")
     
     dg1 = OptimizedDG1()
-    memories = create_test_memories()
+    memories = list(_TEST_MEMORIES)
     
     # 测试不同项目上下文的阈值调整
     contexts = [
@@ -5,7 +5,7 @@
 import asyncio
 import time
 from datetime import datetime, timedelta
-from aceflow.pateoas.optimized_state_manager import OptimizedStateManager, LRUCache, StateIndex
+from aceflow.pateoas.optimized_state_manager import OptimizedStateManager, LRUCache, StateIndex, AsyncStateProcessor
 
 
 def test_lru_cache():
@@ -81,6 +81,98 @@ def test_state_index():
     return True
 
 
+def test_state_index_content_hash_bound():
+    """测试内容哈希索引的容量上限"""
+    print("\n🗂️ 测试内容哈希索引容量上限")
+    
+    index = StateIndex(max_content_hashes=2)
+    now = datetime.now()
+    index.add_state("state1", "project1", now, content_hash="hash1")
+    index.add_state("state2", "project1", now, content_hash="hash2")
+    
+    # 重新访问hash1后，最久未使用的是hash2
+    index.add_state("state1", "project1", now, content_hash="hash1")
+    index.add_state("state3", "project1", now, content_hash="hash3")
+    
+    assert len(index.content_hash_index) == 2
+    assert index.find_by_content_hash("hash1") == "state1"
+    assert index.find_by_content_hash("hash2") is None
+    assert index.find_by_content_hash("hash3") == "state3"
+    
+    print("✓ 内容哈希索引按LRU淘汰")
+    return True
+
+
+def test_state_index_remove_state():
+    """测试从索引中移除状态"""
+    print("\n🗂️ 测试状态索引移除")
+    
+    index = StateIndex()
+    now = datetime.now()
+    index.add_state("state1", "project1", now, ["tag1", "tag2"], "hash1")
+    index.add_state("state2", "project1", now, ["tag2"], "hash2")
+    
+    index.remove_state("state1")
+    
+    assert index.find_by_project("project1") == ["state2"]
+    assert index.find_by_tags(["tag1"]) == []
+    assert index.find_by_tags(["tag2"]) == ["state2"]
+    assert index.find_by_content_hash("hash1") is None
+    assert index.find_by_content_hash("hash2") == "state2"
+    assert "tag1" not in index.tag_index
+    
+    # 重复移除和移除未知状态都应无副作用
+    index.remove_state("state1")
+    index.remove_state("missing")
+    assert index.find_by_project("project1") == ["state2"]
+    
+    # 从持久化数据加载的状态同样可以移除
+    loaded = StateIndex()
+    loaded.load_buckets({"project1": ["state1", "state2"]}, {"tag1": ["state1"]})
+    loaded.remove_state("state1")
+    assert loaded.find_by_project("project1") == ["state2"]
+    assert loaded.find_by_tags(["tag1"]) == []
+    
+    print("✓ 状态索引移除正常")
+    return True
+
+
+def test_state_index_reverse_entries_bound():
+    """测试反向索引不会随状态重建无限增长"""
+    print("\n🗂️ 测试状态索引反向登记上限")
+    
+    index = StateIndex(max_content_hashes=10)
+    now = datetime.now()
+    for i in range(5000):
+        index.add_state("state1", "project1", now, ["current"], f"hash{i}")
+    
+    assert len(index.content_hash_index) == 10
+    assert len(index._state_entries["state1"]) == 3
+    
+    # 清理过期小时分桶时同步注销反向登记
+    for hours in range(1, 50):
+        index.add_state("state1", "project1", now - timedelta(hours=hours))
+    expired = [key for key in index.timestamp_index if key != now.strftime('%Y-%m-%d-%H')]
+    index.drop_timestamp_buckets(expired)
+    assert len(index._state_entries["state1"]) == 3
+    
+    # 重复加载持久化分桶不会累积旧登记
+    index.load_buckets({"project2": ["state1"]}, {})
+    index.load_buckets({"project3": ["state1"]}, {})
+    assert index._state_entries["state1"] == {
+        ('project_index', 'project3'),
+        ('timestamp_index', now.strftime('%Y-%m-%d-%H'))
+    }
+    
+    index.remove_state("state1")
+    assert "state1" not in index._state_entries
+    assert index.content_hash_index == {}
+    assert index.timestamp_index == {}
+    
+    print("✓ 反向登记随分桶清理同步回收")
+    return True
+
+
 def test_optimized_state_manager_basic():
     """测试优化状态管理器基本功能"""
     print("\n⚡ 测试优化状态管理器基本功能")
@@ -120,6 +212,42 @@ def test_optimized_state_manager_basic():
     return True
 
 
+def test_failed_operations_are_counted():
+    """测试构建或保存失败的操作同样计入未命中和同步操作计数"""
+    print("\n📊 测试失败操作的计数")
+    
+    manager = OptimizedStateManager("failure_count_test", cache_size=10)
+    stats = manager.performance_stats
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError("模拟失败")
+    
+    # 状态构建失败
+    misses_before = stats['cache_misses']
+    manager.cache.clear()
+    manager._get_project_context = fail
+    try:
+        manager.get_current_state()
+        assert False, "状态构建应失败"
+    except RuntimeError:
+        pass
+    assert stats['cache_misses'] == misses_before + 1
+    del manager._get_project_context
+    
+    # 状态保存失败
+    sync_before = stats['sync_operations']
+    manager._save_state = fail
+    try:
+        manager.update_state({'test_field': 'value'})
+        assert False, "状态保存应失败"
+    except RuntimeError:
+        pass
+    assert stats['sync_operations'] == sync_before + 1
+    
+    print("✓ 失败操作已计数")
+    return True
+
+
 def test_cache_performance():
     """测试缓存性能"""
     print("\n🚀 测试缓存性能")
@@ -170,15 +298,33 @@ def test_async_operations():
         
         print(f"  - 异步获取状态时间: {async_time:.4f}s")
         
+        # 测试并发获取合并为一次构建
+        hits_before = manager.cache.hit_count
+        states = await asyncio.gather(*(manager.get_current_state_async() for _ in range(3)))
+        assert all(s is states[0] for s in states)
+        assert manager.cache.hit_count == hits_before + 1
+        assert manager._inflight_state is None
+        
+        # 测试并发查找相似状态
+        exact_matches, similar_matches = await asyncio.gather(
+            manager.find_similar_states_async(states[0]),
+            manager.find_similar_states_async({'project_id': 'async_test'}, similarity_threshold=0.1)
+        )
+        assert exact_matches == [(manager._current_state_key, 1.0)]
+        assert isinstance(similar_matches, list)
+        
+        # 并发查询的统计更新不应丢失
+        total_before = manager.performance_stats['total_operations']
+        await asyncio.gather(*(manager.find_similar_states_async(states[0]) for _ in range(20)))
+        assert manager.performance_stats['total_operations'] == total_before + 20
+        
         # 测试异步更新状态
         await manager.update_state({
             'async_test': True,
             'timestamp': datetime.now().isoformat()
         }, async_mode=True)
         
-        # 等待异步操作完成
-        await asyncio.sleep(0.1)
-        
+        # await返回时回调已执行完毕，无需额外等待
         # 检查异步更新是否成功
         assert manager.current_state.get('async_test') == True
         
@@ -193,6 +339,69 @@ def test_async_operations():
     return result
 
 
+def test_async_state_leader_cancellation():
+    """测试发起构建的请求被取消时，等待同一结果的请求仍能拿到状态"""
+    print("\n🛑 测试异步获取状态的取消")
+    
+    async def async_test():
+        manager = OptimizedStateManager("async_cancel_test")
+        processor = manager.async_processor
+        blocker = asyncio.Event()
+        
+        async def blocked_process(*args, **kwargs):
+            await blocker.wait()
+        
+        processor.process_state_async = blocked_process
+        leader = asyncio.create_task(manager.get_current_state_async())
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(manager.get_current_state_async())
+        await asyncio.sleep(0)
+        
+        leader.cancel()
+        await asyncio.sleep(0)
+        assert leader.cancelled()
+        assert manager._inflight_state is not None
+        
+        # 共享构建不受发起者取消影响，放行后等待者正常返回
+        blocker.set()
+        state = await asyncio.wait_for(follower, 2)
+        assert state['project_id'] == "async_cancel_test"
+        assert manager._inflight_state is None
+        return True
+    
+    result = asyncio.run(async_test())
+    
+    print("✓ 取消后等待者正常返回")
+    return result
+
+
+def test_async_state_processor_dispatch():
+    """测试异步状态处理器的操作分发"""
+    print("\n🔀 测试操作分发")
+    
+    processor = AsyncStateProcessor(max_workers=1)
+    try:
+        state_data = {'project_id': 'dispatch_test', 'timestamp': 'now', 'workflow_state': {}}
+        
+        assert processor._execute_state_operation('validate', state_data) is True
+        assert processor._execute_state_operation('deserialize', state_data) is state_data
+        assert 'execution_history' in processor._execute_state_operation('decompress', state_data)
+        
+        serialized = processor._execute_state_operation('serialize', state_data)
+        assert processor._execute_state_operation('deserialize', serialized) == state_data
+        
+        try:
+            processor._execute_state_operation('unknown', state_data)
+            assert False, "未知操作应抛出ValueError"
+        except ValueError:
+            pass
+    finally:
+        processor.executor.shutdown(wait=False)
+    
+    print("✓ 操作分发正常")
+    return True
+
+
 def test_state_history_and_search():
     """测试状态历史和搜索功能"""
     print("\n📚 测试状态历史和搜索功能")
@@ -414,9 +623,15 @@ if __name__ == "__main__":
     tests = [
         test_lru_cache,
         test_state_index,
+        test_state_index_content_hash_bound,
+        test_state_index_remove_state,
+        test_state_index_reverse_entries_bound,
         test_optimized_state_manager_basic,
+        test_failed_operations_are_counted,
         test_cache_performance,
         test_async_operations,
+        test_async_state_leader_cancellation,
+        test_async_state_processor_dispatch,
         test_state_history_and_search,
         test_performance_optimization,
         test_benchmark_performance,
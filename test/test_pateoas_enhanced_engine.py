@@ -281,6 +281,56 @@ def test_pateoas_enhanced_engine():
         traceback.print_exc()
         return False
 
+def test_enhanced_result_fixed_fields_are_copies():
+    """测试增强结果中的固定字段每次返回新副本"""
+    from aceflow.pateoas.enhanced_engine import PATEOASEnhancedEngine
+    from aceflow.pateoas.models import NextAction, ActionType
+    
+    engine = PATEOASEnhancedEngine(project_id="test_project_enhanced_copies")
+    decision_result = {
+        'primary_action': NextAction(
+            action_type=ActionType.CONTINUE,
+            description='继续开发',
+            command='aceflow continue',
+            confidence=0.8,
+            estimated_time='1小时'
+        ),
+        'alternative_actions': [],
+        'confidence': 0.8,
+        'reasoning_chain': []
+    }
+    context = {'current_stage': 'S1', 'task_progress': 0.1}
+    
+    first = engine._enhance_result_with_pateoas(decision_result, {}, context, [])
+    assert isinstance(first['alternative_paths'], list)
+    assert isinstance(first['meta_information']['components_used'], list)
+    
+    # 修改一次结果，不应影响后续结果
+    first['alternative_paths'][0]['risk_level'] = 'changed'
+    first['alternative_paths'].clear()
+    first['meta_information']['components_used'].append('changed')
+    
+    second = engine._enhance_result_with_pateoas(decision_result, {}, context, [])
+    assert second['alternative_paths'][0]['risk_level'] == 'medium'
+    assert len(second['alternative_paths']) == 2
+    assert 'changed' not in second['meta_information']['components_used']
+
+def test_mode_justification_arguments_are_normalized():
+    """测试模式理由缓存不因参数类型而报错或串用文本"""
+    from aceflow.pateoas.enhanced_engine import PATEOASEnhancedEngine
+    
+    engine = PATEOASEnhancedEngine(project_id="test_project_mode_justification")
+    complexity = {'primary_level': 'medium'}
+    
+    assert '5人' in engine._generate_mode_justification('standard', complexity, {'team_size': 5, 'urgency_level': 'normal'})
+    assert '5.0人' in engine._generate_mode_justification('standard', complexity, {'team_size': 5.0, 'urgency_level': 'normal'})
+    
+    # 不可哈希的紧急程度也能生成理由
+    justification = engine._generate_mode_justification('minimal', complexity, {'team_size': 3, 'urgency_level': ['high']})
+    assert '3人' in justification
+
 if __name__ == "__main__":
     success = test_pateoas_enhanced_engine()
+    test_enhanced_result_fixed_fields_are_copies()
+    test_mode_justification_arguments_are_normalized()
     sys.exit(0 if success else 1)
\ No newline at end of file
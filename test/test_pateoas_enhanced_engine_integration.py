@@ -13,7 +13,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 # 添加 pateoas 模块路径
-sys.path.insert(0, str(Path(__file__).parent))
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
 
 from pateoas.enhanced_engine import PATEOASEnhancedEngine
 from pateoas.models import MemoryFragment, MemoryCategory, NextAction, ActionType
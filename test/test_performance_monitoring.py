@@ -14,7 +14,7 @@ def test_performance_monitoring():
     
     # 1. 测试性能监控器基础功能
     print("\n1. 测试性能监控器基础功能")
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_basic_monitoring")
     
     # 模拟操作
     op_id = monitor.start_operation("test_operation")
@@ -96,11 +96,8 @@ def test_performance_thresholds():
     
     monitor = PATEOASPerformanceMonitor("threshold_test")
     
-    # 模拟高响应时间
-    for i in range(5):
-        op_id = monitor.start_operation("slow_operation")
-        time.sleep(0.6)  # 模拟慢操作
-        monitor.end_operation(op_id, "slow_component", True)
+    # 模拟高响应时间（批量记录5次慢操作）
+    monitor.record_operations("slow_component", [(0.6, True)] * 5)
     
     # 检查警报
     summary = monitor.get_performance_summary()
@@ -6,6 +6,7 @@ import time
 import json
 from datetime import datetime, timedelta
 from aceflow.pateoas.enhanced_engine import PATEOASEnhancedEngine
+from aceflow.pateoas import performance_monitor
 from aceflow.pateoas.performance_monitor import PATEOASPerformanceMonitor, PerformanceMetric
 
 
@@ -13,10 +14,10 @@ def test_performance_monitor_initialization():
     """测试性能监控器初始化"""
     print("🧪 测试性能监控器初始化")
     
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_monitor_initialization")
     
     # 验证初始化状态
-    assert monitor.project_id == "test_project"
+    assert monitor.project_id == "test_monitor_initialization"
     assert monitor.current_metrics['total_requests'] == 0
     assert monitor.current_metrics['successful_requests'] == 0
     assert len(monitor.component_performance) == 0
@@ -29,7 +30,7 @@ def test_operation_timing():
     """测试操作计时功能"""
     print("\n⏱️ 测试操作计时功能")
     
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_operation_timing")
     
     # 测试操作计时
     op_id = monitor.start_operation("test_operation")
@@ -56,7 +57,7 @@ def test_metrics_recording():
     """测试指标记录功能"""
     print("\n📊 测试指标记录功能")
     
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_metrics_recording")
     
     # 记录各种指标
     monitor.record_decision_accuracy(0.85)
@@ -84,7 +85,7 @@ def test_performance_summary():
     """测试性能摘要生成"""
     print("\n📋 测试性能摘要生成")
     
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_summary")
     
     # 添加一些测试数据
     op_id = monitor.start_operation("test_op")
@@ -116,7 +117,7 @@ def test_alert_system():
     """测试警报系统"""
     print("\n🚨 测试警报系统")
     
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_alert_system")
     
     # 模拟高响应时间触发警报
     monitor.current_metrics['average_response_time'] = 3.0  # 超过警告阈值
@@ -146,7 +147,7 @@ def test_performance_trends():
     """测试性能趋势分析"""
     print("\n📈 测试性能趋势分析")
     
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_trends")
     
     # 添加一系列指标模拟趋势
     for i in range(20):
@@ -176,7 +177,7 @@ def test_performance_report_generation():
     """测试性能报告生成"""
     print("\n📄 测试性能报告生成")
     
-    monitor = PATEOASPerformanceMonitor("test_project")
+    monitor = PATEOASPerformanceMonitor("test_report_generation")
     
     # 添加测试数据
     op_id = monitor.start_operation("report_test")
@@ -343,6 +344,90 @@ def test_performance_persistence():
     return True
 
 
+def test_bulk_operation_recording():
+    """测试批量记录操作"""
+    print("\n📦 测试批量记录操作")
+    
+    monitor = PATEOASPerformanceMonitor("test_bulk_recording")
+    initial_requests = monitor.current_metrics['total_requests']
+    initial_history = len(monitor.metrics_history)
+    
+    operations = [(0.1 + i * 0.01, i < 8) for i in range(10)]
+    monitor.record_operations("bulk_component", operations)
+    
+    component = monitor.component_performance["bulk_component"]
+    assert component.total_calls == 10
+    assert component.successful_calls == 8
+    assert component.failed_calls == 2
+    assert abs(component.average_time - sum(t for t, _ in operations) / 10) < 1e-9
+    assert component.min_time == operations[0][0]
+    assert component.max_time == operations[-1][0]
+    
+    assert monitor.current_metrics['total_requests'] == initial_requests + 10
+    assert len(monitor.metrics_history) == initial_history + 10
+    assert monitor.metrics_history[-1].name == "bulk_component_execution_time"
+    
+    # 空批次不应产生任何记录
+    monitor.record_operations("bulk_component", [])
+    assert component.total_calls == 10
+    
+    print(f"  - 批量记录调用数: {component.total_calls}")
+    print(f"  - 成功率: {component.success_rate:.2%}")
+    print("✓ 批量记录操作正常")
+    return True
+
+
+def test_background_periodic_save():
+    """测试周期性保存在后台写盘"""
+    print("\n🧵 测试后台周期性保存")
+    
+    monitor = PATEOASPerformanceMonitor("test_background_save")
+    if monitor.metrics_file.exists():
+        monitor.metrics_file.unlink()
+    monitor.metrics_history.clear()
+    
+    try:
+        # 跨过100条触发周期性保存
+        monitor.record_operations("background_component", [(0.01, True)] * 100)
+        performance_monitor._history_writer.flush()
+        
+        assert monitor.metrics_file.exists()
+        with open(monitor.metrics_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert len(data['metrics_history']) == 100
+    finally:
+        # 测试产生的指标文件不留在仓库中
+        if monitor.metrics_file.exists():
+            monitor.metrics_file.unlink()
+    
+    print(f"  - 后台保存的历史记录数量: {len(data['metrics_history'])}")
+    
+    print("✓ 后台周期性保存正常")
+    return True
+
+
+def test_disabled_monitor():
+    """测试关闭性能监控"""
+    print("\n🔕 测试关闭性能监控")
+    
+    monitor = PATEOASPerformanceMonitor("test_disabled_monitor")
+    monitor.enabled = False
+    initial_metrics = monitor.current_metrics.copy()
+    initial_history = len(monitor.metrics_history)
+    
+    op_id = monitor.start_operation("disabled_operation")
+    monitor.end_operation(op_id, "disabled_component")
+    monitor.record_operations("disabled_component", [(0.1, True)] * 3)
+    monitor.record_user_satisfaction(0.1)
+    
+    assert "disabled_component" not in monitor.component_performance
+    assert monitor.current_metrics == initial_metrics
+    assert len(monitor.metrics_history) == initial_history
+    
+    print("✓ 关闭性能监控时不记录数据")
+    return True
+
+
 def test_component_performance_analysis():
     """测试组件性能分析"""
     print("\n🔧 测试组件性能分析")
@@ -392,6 +477,9 @@ if __name__ == "__main__":
         test_user_satisfaction_calculation,
         test_memory_efficiency_calculation,
         test_performance_persistence,
+        test_bulk_operation_recording,
+        test_background_periodic_save,
+        test_disabled_monitor,
         test_component_performance_analysis
     ]
     
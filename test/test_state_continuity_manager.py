@@ -12,7 +12,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 # 添加 pateoas 模块路径
-sys.path.insert(0, str(Path(__file__).parent))
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
 
 from pateoas.state_manager import StateContinuityManager
 from pateoas.models import PATEOASState, MemoryFragment, NextAction, ReasoningStep
@@ -117,6 +119,19 @@ class TestStateContinuityManager(unittest.TestCase):
             self.assertIn('action_type', suggestion)
             self.assertIn('description', suggestion)
     
+    def test_state_declaration_view_is_lazy(self):
+        """测试惰性状态声明只构建被访问的字段"""
+        view = self.state_manager.state_declaration_view()
+        
+        self.assertIsInstance(view['next_suggestions'], list)
+        self.assertEqual(set(view._values), {'next_suggestions'})
+        
+        # 完整声明包含所有字段
+        declaration = view.materialize()
+        self.assertIsInstance(declaration, dict)
+        self.assertEqual(list(declaration), list(view))
+        self.assertIs(declaration['next_suggestions'], view['next_suggestions'])
+    
     def test_state_persistence(self):
         """测试状态持久化"""
         # 更新状态